@@ -0,0 +1,158 @@
+"""
+Audio engine — initialises the pygame mixer once with a small buffer,
+decodes every sound in the asset folders into an in-memory bank up front,
+and plays through a fixed channel pool: one reserved channel for cues (the
+"sus" warning) plus a capped set of punishment voices that steal the oldest
+voice when they are all busy.
+"""
+
+import os
+import threading
+import time
+
+import pygame
+
+# Project root (two levels up: project/detector/audio_engine.py → project/)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+AUDIO_EXT = (".mp3", ".wav", ".ogg")
+SOUND_FOLDERS = (
+    os.path.join(ROOT_DIR, "assets", "audio"),
+    os.path.join(ROOT_DIR, "assets", "media"),
+)
+
+FREQUENCY = 44100
+BUFFER_SAMPLES = 512          # Mixer buffer (~12 ms at 44.1 kHz); pygame's default is 4× larger
+MAX_VOICES = 6                # Punishment sounds playing at once
+STEAL_POLICY = "oldest"       # "oldest" replaces the longest-playing voice; "none" drops the new sound
+
+
+class AudioEngine:
+    CUE_CHANNEL = 0           # Reserved channel, never stolen by punishment voices
+
+    def __init__(self, folders=SOUND_FOLDERS, max_voices=MAX_VOICES,
+                 steal_policy=STEAL_POLICY, buffer_samples=BUFFER_SAMPLES):
+        self.max_voices = max_voices
+        self.steal_policy = steal_policy
+        self.bank: dict = {}              # Absolute path → decoded pygame Sound
+        self._lock = threading.Lock()     # Guards the voice table against off-thread callers
+        self._voice_started: dict = {}    # Voice index → monotonic start time
+
+        self.enabled = self._init_mixer(buffer_samples)
+        if not self.enabled:
+            return
+        pygame.mixer.set_num_channels(max_voices + 1)
+        pygame.mixer.set_reserved(1)
+        self.cue_channel = pygame.mixer.Channel(self.CUE_CHANNEL)
+        self.voices = [pygame.mixer.Channel(i + 1) for i in range(max_voices)]
+
+        self.load(folders)
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _init_mixer(buffer_samples) -> bool:
+        if pygame.mixer.get_init():
+            return True
+        try:
+            pygame.mixer.pre_init(FREQUENCY, -16, 2, buffer_samples)
+            pygame.mixer.init()
+            return True
+        except pygame.error as e:
+            print(f"Error initialising audio mixer: {e}")
+            return False
+
+    def load(self, folders):
+        """Decode every audio file in ``folders`` into the sound bank."""
+        start = time.perf_counter()
+        for folder in folders:
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                if name.lower().endswith(AUDIO_EXT):
+                    self._load(os.path.join(folder, name))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Audio engine: {len(self.bank)} sounds decoded in {elapsed_ms:.0f} ms")
+
+    def _load(self, path: str):
+        path = os.path.abspath(path)
+        sound = self.bank.get(path)
+        if sound is None:
+            try:
+                sound = self.bank[path] = pygame.mixer.Sound(path)
+            except Exception as e:
+                print(f"Error loading audio {path}: {e}")
+        return sound
+
+    # ------------------------------------------------------------------
+    # Playback
+    # ------------------------------------------------------------------
+
+    def play_cue(self, path: str) -> bool:
+        """Play ``path`` on the reserved cue channel, restarting any cue already playing."""
+        if not self.enabled:
+            return False
+        sound = self._load(path)
+        if sound is None:
+            return False
+        self.cue_channel.play(sound)
+        return True
+
+    def play(self, path: str) -> bool:
+        """Play ``path`` on a free voice (or a stolen one); return whether it started."""
+        if not self.enabled:
+            return False
+        sound = self._load(path)
+        if sound is None:
+            return False
+        with self._lock:
+            index = self._pick_voice()
+            if index is None:
+                return False
+            self.voices[index].play(sound)
+            self._voice_started[index] = time.monotonic()
+        return True
+
+    def _pick_voice(self):
+        for index, channel in enumerate(self.voices):
+            if not channel.get_busy():
+                return index
+        if self.steal_policy == "oldest":
+            # A busy voice with no recorded start (cleared by stop_voices()
+            # while still fading out) is older than any tracked one.
+            for index in range(len(self.voices)):
+                if index not in self._voice_started:
+                    return index
+            return min(self._voice_started, key=self._voice_started.get)
+        return None
+
+    def stop_voices(self):
+        """Silence every punishment voice; the cue channel is left alone."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for channel in self.voices:
+                channel.stop()
+            self._voice_started.clear()
+
+
+_engine = None
+
+
+def get_audio_engine() -> AudioEngine:
+    """Return the process-wide engine, creating (and preloading) it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = AudioEngine()
+    return _engine
+
+
+if __name__ == "__main__":
+    engine = get_audio_engine()
+    sus_path = os.path.join(ROOT_DIR, "assets", "audio", "sus.mp3")
+    start = time.perf_counter()
+    engine.play_cue(sus_path)
+    print(f"Cue dispatch: {(time.perf_counter() - start) * 1000:.2f} ms")
+    time.sleep(1)
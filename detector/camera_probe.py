@@ -0,0 +1,261 @@
+"""
+Camera probe — finds the cameras that actually exist, on a background
+thread. Each device is opened with the platform's preferred backend (V4L2 on
+Linux, DirectShow on Windows, AVFoundation on macOS) and its open latency,
+native mode and supported resolutions are recorded. Results are cached in
+``~/.cache/anti-doomscroll/cameras.json`` so the camera dropdown can be
+filled instantly on the next launch while a fresh probe runs.
+
+A video file can stand in for a webcam (set VIRTUAL_CAMERA=path/to/clip.mp4,
+or pass the path as a camera source): it is read at its own frame rate and
+looped, so the whole pipeline can be exercised without hardware.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+import cv2
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "CAMERA_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "anti-doomscroll", "cameras.json"),
+)
+VIRTUAL_CAMERA = os.environ.get("VIRTUAL_CAMERA")
+
+MAX_PROBE_INDEX = 4           # Indices tried where devices can't be listed (Windows/macOS)
+PROBE_MODES = ((320, 240), (640, 480), (1280, 720), (1920, 1080))
+PREFERRED_INDICES = (1, 0)    # External webcam first, then the built-in one
+
+
+def preferred_backend() -> int:
+    if sys.platform.startswith("linux"):
+        return cv2.CAP_V4L2
+    if sys.platform == "win32":
+        return cv2.CAP_DSHOW
+    if sys.platform == "darwin":
+        return cv2.CAP_AVFOUNDATION
+    return cv2.CAP_ANY
+
+
+def candidate_indices() -> list:
+    """Device indices worth probing: the /dev/video* nodes on Linux, a small range elsewhere."""
+    if sys.platform.startswith("linux"):
+        indices = []
+        for name in os.listdir("/dev"):
+            match = re.fullmatch(r"video(\d+)", name)
+            if match:
+                indices.append(int(match.group(1)))
+        return sorted(indices)
+    return list(range(MAX_PROBE_INDEX))
+
+
+def parse_source(value):
+    """Camera source from user input: ``"1"`` → device index 1, anything else → file path."""
+    value = str(value).strip()
+    return int(value) if value.isdigit() else value
+
+
+def source_label(device: dict) -> str:
+    source = device["source"]
+    if isinstance(source, str):
+        return f"file: {os.path.basename(source)}"
+    if device.get("width"):
+        return f"{source}: {device['width']}x{device['height']}"
+    return str(source)
+
+
+# ----------------------------------------------------------------------
+# Opening sources
+# ----------------------------------------------------------------------
+
+class VirtualCamera:
+    """A video file posing as a webcam: reads are paced to the file's fps and it loops."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_interval = 1.0 / fps if fps and fps > 0 else 1 / 30
+        self._next_frame_at = None
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def grab(self) -> bool:
+        now = time.monotonic()
+        if self._next_frame_at is None:
+            self._next_frame_at = now
+        elif now < self._next_frame_at:
+            time.sleep(self._next_frame_at - now)
+        self._next_frame_at = max(self._next_frame_at + self.frame_interval, time.monotonic())
+        if self.cap.grab():
+            return True
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return self.cap.grab()
+
+    def retrieve(self):
+        return self.cap.retrieve()
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value) -> bool:
+        return False   # Fixed mode: the file's own resolution
+
+    def release(self):
+        self.cap.release()
+
+
+def open_capture(source, backend=None):
+    """Open a device index with the platform backend, or a file path as a VirtualCamera."""
+    if isinstance(source, str):
+        return VirtualCamera(source)
+    return cv2.VideoCapture(source, preferred_backend() if backend is None else backend)
+
+
+def probe_device(source):
+    """Open ``source`` and describe it, or return ``None`` if it yields no frames."""
+    start = time.perf_counter()
+    cap = open_capture(source)
+    try:
+        if not cap.isOpened():
+            return None
+        open_ms = (time.perf_counter() - start) * 1000
+        success, frame = cap.read()
+        if not success:
+            return None   # e.g. V4L2 metadata nodes, which open but never stream
+        height, width = frame.shape[:2]
+        fps = cap.get(cv2.CAP_PROP_FPS) or None
+
+        modes = [(width, height)]
+        if not isinstance(source, str):
+            for mode in PROBE_MODES:
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode[0])
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode[1])
+                actual = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                          int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                if actual == mode and mode not in modes:
+                    modes.append(mode)
+        return {
+            "source": source,
+            "open_ms": round(open_ms, 1),
+            "width": width,
+            "height": height,
+            "fps": fps,
+            "modes": sorted(modes),
+        }
+    finally:
+        cap.release()
+
+
+# ----------------------------------------------------------------------
+# Prober
+# ----------------------------------------------------------------------
+
+class CameraProber:
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, virtual_source=VIRTUAL_CAMERA):
+        self.cache_path = cache_path
+        self.virtual_source = virtual_source
+        self.devices = self._load()   # Cached result, usable before the probe finishes
+        self.ready = threading.Event()
+        self._thread = None
+
+    def default_source(self):
+        return preferred_sources(self.devices, self.virtual_source)[0]
+
+    def refresh_async(self, in_use=()):
+        """
+        Probe on a background thread; ``ready`` is set when ``devices`` is
+        fresh. Sources in ``in_use`` must be ones that are actually open and
+        streaming: they are not reopened, and are listed from their cached
+        entry (or bare, if there is none).
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.ready.clear()
+        self._thread = threading.Thread(target=self.refresh, args=(in_use,), daemon=True)
+        self._thread.start()
+
+    def refresh(self, in_use=()):
+        start = time.perf_counter()
+        cached = {device["source"]: device for device in self.devices}
+        sources = candidate_indices()
+        if self.virtual_source:
+            sources.append(self.virtual_source)
+
+        devices = []
+        for source in sources:
+            if source in in_use:
+                devices.append(cached.get(source, {"source": source}))
+                continue
+            device = probe_device(source)
+            if device is not None:
+                devices.append(device)
+
+        self.devices = devices
+        self._save(devices)
+        self.ready.set()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Camera probe: {len(devices)} camera(s) found in {elapsed_ms:.0f} ms")
+
+    def _load(self) -> list:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return []
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading camera cache {self.cache_path}: {e}")
+            return []
+        if data.get("platform") != sys.platform:
+            return []
+        return [
+            device for device in data.get("devices", [])
+            if not isinstance(device["source"], str) or os.path.exists(device["source"])
+        ]
+
+    def _save(self, devices):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, "w") as f:
+                json.dump({"platform": sys.platform, "devices": devices}, f, indent=1)
+        except OSError as e:
+            print(f"Error writing camera cache {self.cache_path}: {e}")
+
+
+def preferred_sources(devices=None, virtual_source=VIRTUAL_CAMERA) -> list:
+    """
+    Sources to try, best first: the virtual camera if configured, then the
+    preferred indices that were found, then any other device found. Without
+    any probe result (``devices`` defaults to the cache) the preferred indices
+    are tried blind.
+    """
+    if devices is None:
+        devices = CameraProber(virtual_source=None).devices
+    known = [device["source"] for device in devices]
+    sources = [virtual_source] if virtual_source else []
+    if known:
+        sources += [index for index in PREFERRED_INDICES if index in known]
+        sources += [source for source in known if source not in sources]
+    else:
+        sources += list(PREFERRED_INDICES)
+    return sources
+
+
+if __name__ == "__main__":
+    prober = CameraProber()
+    prober.refresh()
+    for device in prober.devices:
+        print(f"  {source_label(device):<28} open {device.get('open_ms', '?')} ms  "
+              f"fps {device.get('fps')}  modes {device.get('modes')}")
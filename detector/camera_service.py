@@ -0,0 +1,222 @@
+"""
+Camera service — one long-lived owner of the webcam, shared by the focus
+tracker, the break screen and the challenge wheel. Screens ``acquire()`` a
+subscription and ``release()`` it when they close; the device stays open
+while anyone holds a subscription, plus a short linger so a screen
+transition (release, then acquire on the next screen) reuses the open device
+instead of paying the multi-second reopen.
+
+The device is opened and read on a background thread. Every frame is
+``grab()``bed; it is only decoded when some subscriber is due for one (each
+subscription has its own interval), and then fanned out to each due
+subscriber's single-slot "latest frame wins" buffer (the same array goes to
+every subscriber, so treat frames as read-only). Subscriptions expose the
+same ``latest()`` / ``set_interval()`` / ``stats()`` API as FrameGrabber.
+"""
+
+import threading
+import time
+
+import cv2
+
+from .camera_probe import open_capture, preferred_sources
+from .frame_grabber import FrameGrabber
+
+CAPTURE_SIZE = (640, 480)     # Negotiated once when the device opens
+LINGER_S = 5.0                # Keep the device open this long after the last release
+OPEN_RETRY_S = 2.0            # Pause before retrying a device that failed to open
+
+
+class CameraSubscription:
+    def __init__(self, service, interval=0.0, timer=None):
+        self.service = service
+        self.decode_interval = interval
+        self.timer = timer        # Optional StageTimer; records the "read" stage
+
+        self._frame = None        # Single slot: newest frame not yet consumed
+        self._last_delivery = 0.0
+        self.frames_captured = 0
+        self.frames_dropped = 0
+
+    def latest(self):
+        """Return the newest unseen frame, or ``None`` if nothing new arrived."""
+        with self.service._lock:
+            frame = self._frame
+            self._frame = None
+        return frame
+
+    def set_interval(self, seconds: float):
+        self.decode_interval = seconds
+
+    def stats(self) -> dict:
+        with self.service._lock:
+            return {
+                "captured": self.frames_captured,
+                "dropped": self.frames_dropped,
+            }
+
+    def release(self):
+        self.service.release(self)
+
+
+class CameraService:
+    def __init__(self, capture_size=CAPTURE_SIZE, linger_s=LINGER_S):
+        self.capture_size = capture_size
+        self.linger_s = linger_s
+
+        self._lock = threading.Lock()
+        self._subscribers: list = []
+        self._released_at = None     # Monotonic time the last subscriber left
+        self._thread = None          # Running capture thread (None once it decides to exit)
+        self._last_thread = None
+        self._is_running = False
+
+        self.index = None            # Index of the open (or opening) device
+        self._requested_index = None
+        self.cap = None
+        self.open_ms = None          # How long the last open took
+        self.is_opening = False      # An open attempt is in progress
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def acquire(self, index=None, interval=0.0, timer=None) -> CameraSubscription:
+        """
+        Subscribe to camera ``index`` — a device index or a video file path
+        (``None`` = whatever is open, else the first of the probed
+        ``preferred_sources()`` that opens). Asking for a different index
+        than the open one switches the device for every subscriber.
+        """
+        subscription = CameraSubscription(self, interval, timer)
+        with self._lock:
+            self._subscribers.append(subscription)
+            self._released_at = None
+            if index is not None and index != self._requested_index:
+                self._requested_index = index
+        self._ensure_running()
+        return subscription
+
+    def release(self, subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+            if not self._subscribers:
+                self._released_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+
+    def shutdown(self):
+        """Close the device now, ignoring any linger."""
+        self._is_running = False
+        thread = self._last_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+
+    # ------------------------------------------------------------------
+    # Device handling (capture thread)
+    # ------------------------------------------------------------------
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._is_running = True
+            self._thread = threading.Thread(
+                target=self._capture_loop, args=(self._last_thread,), daemon=True
+            )
+            self._last_thread = self._thread
+            self._thread.start()
+
+    def _should_stop(self) -> bool:
+        """Decide (atomically with acquire) whether the capture thread exits."""
+        with self._lock:
+            lingered_out = (
+                not self._subscribers and self._released_at is not None
+                and time.monotonic() - self._released_at >= self.linger_s
+            )
+            if self._is_running and not lingered_out:
+                return False
+            self._thread = None
+            return True
+
+    def _open(self, index):
+        candidates = preferred_sources() if index is None else [index]
+        for candidate in candidates:
+            start = time.perf_counter()
+            cap = open_capture(candidate)
+            if cap.isOpened():
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.capture_size[0])
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.capture_size[1])
+                self.open_ms = (time.perf_counter() - start) * 1000
+                print(f"Camera {candidate} opened in {self.open_ms:.0f} ms")
+                return cap, candidate
+            cap.release()
+        print(f"Error: could not open camera {index if index is not None else candidates}")
+        return None, index
+
+    def _close(self):
+        if self.cap is not None:
+            self.cap.release()
+        self.cap = None
+
+    def _capture_loop(self, previous_thread):
+        # A previous thread may still be closing the device it just gave up.
+        if previous_thread is not None:
+            previous_thread.join()
+        try:
+            while not self._should_stop():
+                wanted = self._requested_index
+                if self.cap is None or (wanted is not None and wanted != self.index):
+                    self._close()
+                    self.is_opening = True
+                    try:
+                        self.cap, self.index = self._open(wanted)
+                    finally:
+                        self.is_opening = False
+                    self._requested_index = self.index
+                    if self.cap is None:
+                        time.sleep(OPEN_RETRY_S)
+                        continue
+
+                start = time.perf_counter()
+                if not self.cap.grab():
+                    time.sleep(FrameGrabber.READ_FAIL_BACKOFF_S)
+                    continue
+                now = time.monotonic()
+                with self._lock:
+                    due = [
+                        s for s in self._subscribers
+                        if now - s._last_delivery >= s.decode_interval
+                    ]
+                if not due:
+                    continue
+                success, frame = self.cap.retrieve()
+                if not success:
+                    continue
+                read_ms = (time.perf_counter() - start) * 1000
+                with self._lock:
+                    for subscription in due:
+                        if subscription._frame is not None:
+                            subscription.frames_dropped += 1
+                        subscription._frame = frame
+                        subscription._last_delivery = now
+                        subscription.frames_captured += 1
+                for subscription in due:
+                    if subscription.timer is not None:
+                        subscription.timer.record("read", read_ms)
+        finally:
+            self._close()
+
+
+_service = None
+
+
+def get_camera_service() -> CameraService:
+    """Return the process-wide camera service."""
+    global _service
+    if _service is None:
+        _service = CameraService()
+    return _service
@@ -5,25 +5,45 @@ when distractions exceed the configured threshold.
 """
 
 import os
+import time
 import tkinter as tk
 from tkinter import ttk
 
 import cv2
-import pygame
 from PIL import Image, ImageTk
 
+from .audio_engine import get_audio_engine
+from .camera_probe import CameraProber, parse_source, source_label
+from .camera_service import get_camera_service
+from .face_backends import DEFAULT_BACKEND, create_face_detector
+from .face_search import create_face_search, process_frame
+from .focus_state import (
+    DISTRACTION_LIMIT, DISTRACTION_THRESHOLD_S, MAX_TICK_S, SUS_AUDIO_DELAY_S,
+    FocusStateMachine,
+)
+from .grass_service import get_grass_service
+from .power_mode import AdaptiveFrameRate
 from .punisher import Punisher
+from .stage_timer import StageTimer
+from .vision_worker import VisionWorker
 from ui.pomodoro_timer import RizeGlowBar
 from ui.spinning_wheel import ChallengeWheel
 from ui.break_timer import BreakApp
+from ui.view_state import ViewState
 
 # Project root (two levels up: project/detector/doomscroll_app.py → project/)
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-# Tuneable constants
-DISTRACTION_THRESHOLD = 30   # Consecutive no-face frames before "distracted"
-DISTRACTION_LIMIT = 5         # Total distractions before the challenge dialog
-SUS_AUDIO_FRAME = 10          # Frame at which to play the "sus" audio cue
+# Tuneable constants (distraction thresholds live in focus_state.py)
+DETECTION_MODE = "roi"        # "full" scans every frame; "roi" searches near the last face first;
+                              # "track" runs the cascade every Nth frame and tracks in between
+USE_VISION_WORKER = False     # Run capture + detection in a separate process (vision_worker.py)
+FACE_DETECTOR_PARAMS = {"scale_factor": 1.1, "min_neighbors": 6}
+FACE_MIN_SIZE = (100, 100)
+GRASS_PREWARM_MARGIN = 2      # Start loading the grass model this many distractions before the limit
+CAMERA_PROBE_POLL_MS = 200    # How often the UI checks whether the camera probe finished
+CAMERA_OPEN_WAIT_S = 5.0      # Longest the probe waits for the selected camera to open
+SHOW_TIMING_OVERLAY = False   # Per-stage timing overlay on the preview (toggle with F3)
 
 
 class DoomscrollApp:
@@ -33,24 +53,45 @@ class DoomscrollApp:
         self.window.title("Doomscroll Blocker")
         self.window.configure(bg="#8ACE00")
 
-        pygame.mixer.init()
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-        )
+        self.audio = get_audio_engine()
+        self.view = ViewState()
+        self.timer = StageTimer()
+        self.show_timing_overlay = SHOW_TIMING_OVERLAY
+        self.window.bind("<F3>", self._toggle_timing_overlay)
+
+        self.face_search = None
+        if not USE_VISION_WORKER:
+            self.face_detector = create_face_detector(
+                DEFAULT_BACKEND, **FACE_DETECTOR_PARAMS
+            )
+            self.face_search = create_face_search(
+                DETECTION_MODE, self.face_detector, min_size=FACE_MIN_SIZE
+            )
+
+        # Cached camera list fills the dropdown at once; a fresh probe
+        # refines it in the background.
+        self.camera_prober = CameraProber()
+        self._camera_sources = {}   # Dropdown label -> camera source
 
         self._build_ui()
+        self._populate_cameras(self.camera_prober.default_source())
 
         self.wheel_launched = False
-        self.cap = None
+        self.camera = None         # Subscription to the shared camera service
+        self.vision_worker = None
+        self._camera_loading = False
         self._switch_camera()
+        self._probe_requested_at = time.monotonic()
+        self._start_camera_probe()
 
-        self.distraction_frames = 0
-        self.threshold = DISTRACTION_THRESHOLD
-        self.is_currently_distracted = False
-        self.total_distractions = 0
+        self.focus = FocusStateMachine(
+            DISTRACTION_THRESHOLD_S, SUS_AUDIO_DELAY_S, DISTRACTION_LIMIT
+        )
+        self.frame_rate = AdaptiveFrameRate()
+        self._last_tick = None
 
         media_dir = os.path.join(ROOT_DIR, "assets", "media")
-        self.punisher = Punisher(media_dir, window)
+        self.punisher = Punisher(media_dir, window, audio=self.audio)
 
         self.pomodoro_window = tk.Toplevel(self.window)
         self.pomodoro_bar = RizeGlowBar(self.pomodoro_window)
@@ -70,12 +111,11 @@ class DoomscrollApp:
             font=("Arial", 14, "bold"), bg="#8ACE00", fg="black",
         ).pack(side=tk.LEFT)
 
-        self.camera_var = tk.StringVar(value="1")
-        camera_dropdown = ttk.Combobox(
-            camera_frame, textvariable=self.camera_var,
-            values=["0", "1", "2", "3"], width=5,
+        self.camera_var = tk.StringVar()
+        self.camera_dropdown = ttk.Combobox(
+            camera_frame, textvariable=self.camera_var, width=18,
         )
-        camera_dropdown.pack(side=tk.LEFT, padx=10)
+        self.camera_dropdown.pack(side=tk.LEFT, padx=10)
 
         tk.Button(
             camera_frame, text="SWITCH",
@@ -98,20 +138,107 @@ class DoomscrollApp:
         )
         self.counter_label.pack(pady=5)
 
+        self.stats_label = tk.Label(
+            self.window, text="RATE: -- FPS | CPU: -- s/min | DROPPED FRAMES: 0",
+            font=("Arial", 10), bg="#8ACE00", fg="black",
+        )
+        self.stats_label.pack(pady=(0, 5))
+
     # ------------------------------------------------------------------
     # Camera management
     # ------------------------------------------------------------------
 
+    def _populate_cameras(self, selected):
+        """Fill the dropdown from the prober's devices, selecting ``selected``."""
+        self._camera_sources = {
+            source_label(device): device["source"] for device in self.camera_prober.devices
+        }
+        labels = list(self._camera_sources)
+        if selected not in self._camera_sources.values():
+            labels.append(str(selected))
+            self._camera_sources[str(selected)] = selected
+        self.camera_dropdown.configure(values=labels)
+        for label, source in self._camera_sources.items():
+            if source == selected:
+                self.camera_var.set(label)
+
+    def _start_camera_probe(self):
+        """
+        Probe once the selected camera has finished opening, so the probe
+        never fights the service (or worker) for the device; the camera that
+        is streaming by then is listed without being reopened.
+        """
+        if not self.is_running:
+            return
+        waited = time.monotonic() - self._probe_requested_at
+        if self._camera_opening() and waited < CAMERA_OPEN_WAIT_S:
+            self.window.after(CAMERA_PROBE_POLL_MS, self._start_camera_probe)
+            return
+        self.camera_prober.refresh_async(in_use=self._open_camera_sources())
+        self._poll_camera_probe()
+
+    def _poll_camera_probe(self):
+        if not self.is_running:
+            return
+        if self.camera_prober.ready.is_set():
+            selected = self._selected_source()
+            found = [device["source"] for device in self.camera_prober.devices]
+            if selected in found or not found:
+                self._populate_cameras(selected)
+            else:
+                # The guessed or cached camera didn't stream; move to one that does.
+                self._populate_cameras(self.camera_prober.default_source())
+                self._switch_camera()
+            return
+        self.window.after(CAMERA_PROBE_POLL_MS, self._poll_camera_probe)
+
+    def _camera_opening(self) -> bool:
+        if self.vision_worker is not None:
+            return self.vision_worker.frames_captured == 0
+        service = get_camera_service()
+        return service.is_opening or (self.camera is not None and not service.is_open)
+
+    def _open_camera_sources(self) -> set:
+        """Sources that are actually open and streaming right now."""
+        if self.vision_worker is not None:
+            return {self._selected_source()} if self.vision_worker.frames_captured else set()
+        service = get_camera_service()
+        return {service.index} if service.is_open else set()
+
+    def _selected_source(self):
+        value = self.camera_var.get()
+        return self._camera_sources.get(value, parse_source(value))
+
     def _switch_camera(self):
-        self.status_label.config(text="LOADING CAMERA...", fg="white")
-        self.window.update()
-        if self.cap is not None:
-            self.cap.release()
-        camera_index = int(self.camera_var.get())
-        self.cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        self.status_label.config(text="STATUS: FOCUSED", fg="black")
+        # Opening happens off the Tk thread (service capture thread or the
+        # vision worker); the status stays on LOADING until a frame arrives.
+        camera_source = self._selected_source()
+        service = get_camera_service()
+        if USE_VISION_WORKER or not (service.is_open and service.index == camera_source):
+            self.view.apply(self.status_label, text="LOADING CAMERA...", fg="white")
+            self._camera_loading = True
+        self._release_camera()
+        if USE_VISION_WORKER:
+            self.vision_worker = VisionWorker(
+                camera_source, detection_mode=DETECTION_MODE,
+                backend=DEFAULT_BACKEND,
+                detector_params=FACE_DETECTOR_PARAMS,
+                search_params={"min_size": FACE_MIN_SIZE},
+            )
+            self.vision_worker.start()
+        else:
+            # The service keeps the device open across screens, so switching
+            # back to an already-open camera is instant.
+            self.camera = service.acquire(camera_source, timer=self.timer)
+
+    def _release_camera(self):
+        """Stop the vision worker, or hand our camera subscription back to the service."""
+        if self.vision_worker is not None:
+            self.vision_worker.stop()
+            self.vision_worker = None
+        if self.camera is not None:
+            self.camera.release()
+            self.camera = None
 
     # ------------------------------------------------------------------
     # Distraction dialog
@@ -159,8 +286,7 @@ class DoomscrollApp:
     def _take_break(self, dialog):
         dialog.destroy()
         self.is_running = False
-        if hasattr(self, "cap") and self.cap and self.cap.isOpened():
-            self.cap.release()
+        self._release_camera()
         self.punisher.stop_punishment()
         if self.pomodoro_window.winfo_exists():
             self.pomodoro_window.destroy()
@@ -184,88 +310,156 @@ class DoomscrollApp:
     # ------------------------------------------------------------------
 
     def update_frame(self):
-        success, frame = self.cap.read()
-        if success:
-            frame = cv2.flip(frame, 1)
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-            faces = self.face_cascade.detectMultiScale(
-                gray, scaleFactor=1.1, minNeighbors=6, minSize=(100, 100)
-            )
+        detection = self._next_detection()
+        if detection is not None:
+            frame_rgb, faces = detection
+            if self._camera_loading:
+                self._camera_loading = False
+                self.view.apply(self.status_label, text="STATUS: FOCUSED", fg="black")
+
+            now = time.monotonic()
+            dt = 0.0 if self._last_tick is None else min(now - self._last_tick, MAX_TICK_S)
+            self._last_tick = now
+
+            with self.timer.stage("decide"):
+                if len(faces) == 0:
+                    self._handle_no_face(dt)
+                else:
+                    self._handle_face_detected(dt)
+
+                self._sync_pomodoro_state()
+                self._update_frame_rate(len(faces) > 0, now)
+                self._report_stats()
+
+            with self.timer.stage("draw"):
+                for (x, y, w, h) in faces:
+                    cv2.rectangle(frame_rgb, (x, y), (x + w, y + h), (0, 255, 0), 2)
+                if self.show_timing_overlay:
+                    self._draw_timing_overlay(frame_rgb)
+
+            with self.timer.stage("fromarray"):
+                img = Image.fromarray(frame_rgb)
+            with self.timer.stage("photoimage"):
+                imgtk = ImageTk.PhotoImage(image=img)
+                self.video_label.imgtk = imgtk
+                self.video_label.configure(image=imgtk)
+
+            self.timer.maybe_dump(now)
 
-            for (x, y, w, h) in faces:
-                cv2.rectangle(frame_rgb, (x, y), (x + w, y + h), (0, 255, 0), 2)
-
-            if len(faces) == 0:
-                self._handle_no_face()
-            else:
-                self._handle_face_detected()
+        if self.is_running:
+            self.window.after(self.frame_rate.interval_ms, self.update_frame)
+
+    def _next_detection(self):
+        """Return ``(frame_rgb, faces)`` for the newest frame, or ``None``."""
+        if self.vision_worker is not None:
+            result = self.vision_worker.latest()
+            if result is None:
+                return None
+            for name, ms in result[3].items():
+                self.timer.record(name, ms)
+            return result[:2]
+
+        frame = self.camera.latest() if self.camera is not None else None
+        if frame is None:
+            return None
+        return process_frame(frame, self.face_search, self.timer)
 
-            self._sync_pomodoro_state()
+    # ------------------------------------------------------------------
+    # Timing overlay
+    # ------------------------------------------------------------------
 
-            img = Image.fromarray(frame_rgb)
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.video_label.imgtk = imgtk
-            self.video_label.configure(image=imgtk)
+    def _toggle_timing_overlay(self, _event=None):
+        self.show_timing_overlay = not self.show_timing_overlay
 
-        if self.is_running:
-            self.window.after(15, self.update_frame)
+    def _draw_timing_overlay(self, frame_rgb):
+        for i, line in enumerate(self.timer.overlay_lines()):
+            y = 20 + i * 18
+            cv2.putText(frame_rgb, line, (10, y), cv2.FONT_HERSHEY_PLAIN,
+                        1.0, (0, 0, 0), 3, cv2.LINE_AA)
+            cv2.putText(frame_rgb, line, (10, y), cv2.FONT_HERSHEY_PLAIN,
+                        1.0, (138, 206, 0), 1, cv2.LINE_AA)
 
-    def _handle_no_face(self):
-        self.distraction_frames += 1
+    def _handle_no_face(self, dt):
+        events = self.focus.update(False, dt)
 
-        if self.distraction_frames == SUS_AUDIO_FRAME:
-            sus_path = os.path.join(ROOT_DIR, "assets", "audio", "sus.mp3")
-            if os.path.exists(sus_path):
-                pygame.mixer.music.load(sus_path)
-                pygame.mixer.music.play()
+        if "sus_cue" in events:
+            self.audio.play_cue(os.path.join(ROOT_DIR, "assets", "audio", "sus.mp3"))
 
-        if self.distraction_frames >= self.threshold:
-            self.is_currently_distracted = True
-            self.status_label.config(text="LOOKING AWAY!", fg="red")
+        focus = self.focus
+        if focus.is_currently_distracted:
+            self.view.apply(self.status_label, text="LOOKING AWAY!", fg="red")
             self.punisher.start_punishment()
         else:
-            self.status_label.config(
-                text=f"LOSING FOCUS... {self.distraction_frames}/{self.threshold}",
+            self.view.apply(
+                self.status_label,
+                text=f"LOSING FOCUS... {focus.distraction_seconds:.1f}/{focus.threshold:.1f}s",
                 fg="white",
             )
 
-    def _handle_face_detected(self):
-        if self.is_currently_distracted:
-            self.total_distractions += 1
-            self.counter_label.config(text=f"DISTRACTIONS: {self.total_distractions}")
-            self.is_currently_distracted = False
+    def _handle_face_detected(self, dt):
+        focus = self.focus
+        was_recovering = focus.distraction_seconds > 0
+        events = focus.update(True, dt)
+
+        if "distraction_ended" in events:
+            self.view.apply(self.counter_label, text=f"DISTRACTIONS: {focus.total_distractions}")
             self.punisher.stop_punishment()
+            if focus.total_distractions >= focus.limit - GRASS_PREWARM_MARGIN:
+                get_grass_service().start()   # Warm by the time the wheel opens
 
-        if self.distraction_frames > 0:
-            self.distraction_frames = max(0, self.distraction_frames - 2)
-            self.status_label.config(
-                text=f"RECOVERING FOCUS... {self.distraction_frames}/{self.threshold}",
+        if was_recovering:
+            self.view.apply(
+                self.status_label,
+                text=f"RECOVERING FOCUS... {focus.distraction_seconds:.1f}/{focus.threshold:.1f}s",
                 fg="white",
             )
 
-        if self.total_distractions >= DISTRACTION_LIMIT and not self.wheel_launched:
-            self.status_label.config(
+        if "limit_reached" in events and not self.wheel_launched:
+            self.view.apply(
+                self.status_label,
                 text="WARNING: DOOMSCROLLING!", fg="red",
                 font=("Arial", 28, "bold"),
             )
             self.wheel_launched = True
             self.is_running = False
-            if hasattr(self, "cap") and self.cap and self.cap.isOpened():
-                self.cap.release()
+            self._release_camera()
             self._show_distraction_dialog()
 
+    def _update_frame_rate(self, face_present, now):
+        """Idle at a low rate while focus is steady; ramp up on the first miss."""
+        was_idle = self.frame_rate.is_idle
+        focused = face_present and self.focus.distraction_seconds == 0
+        self.frame_rate.update(focused, now)
+        if self.frame_rate.is_idle != was_idle:
+            source = self.vision_worker or self.camera
+            if source is not None:
+                idle_s = self.frame_rate.idle_interval_ms / 1000
+                source.set_interval(idle_s * 0.9 if self.frame_rate.is_idle else 0.0)
+
+    def _report_stats(self):
+        source = self.vision_worker or self.camera
+        if source is None:
+            return
+        stats = source.stats()
+        self.view.apply(
+            self.stats_label,
+            text=(
+                f"RATE: {self.frame_rate.current_fps():.1f} FPS | "
+                f"CPU: {self.frame_rate.cpu_seconds_per_minute():.1f} s/min | "
+                f"DROPPED FRAMES: {stats['dropped']} / {stats['captured']}"
+            )
+        )
+
     def _sync_pomodoro_state(self):
         if not self.pomodoro_window.winfo_exists():
             return
-        if self.is_currently_distracted:
+        if self.focus.is_currently_distracted:
             self.pomodoro_bar.focus_state = "distracted"
-        elif self.distraction_frames > 0:
+        elif self.focus.distraction_seconds > 0:
             self.pomodoro_bar.focus_state = "looking_away"
         else:
             self.pomodoro_bar.focus_state = "focused"
-        self.pomodoro_bar.distractions = self.total_distractions
+        self.pomodoro_bar.distractions = self.focus.total_distractions
 
     # ------------------------------------------------------------------
     # Challenge wheel
@@ -274,8 +468,7 @@ class DoomscrollApp:
     def _launch_wheel(self):
         self.punisher.stop_punishment()
         self.is_running = False
-        if hasattr(self, "cap") and self.cap and self.cap.isOpened():
-            self.cap.release()
+        self._release_camera()
         if self.pomodoro_window.winfo_exists():
             self.pomodoro_window.destroy()
         self.window.withdraw()
@@ -288,10 +481,14 @@ class DoomscrollApp:
     # Cleanup
     # ------------------------------------------------------------------
 
-    def __del__(self):
+    def cleanup(self):
+        """Stop the frame loop and give the camera back (the tracker window is closing)."""
         self.is_running = False
-        if hasattr(self, "cap") and self.cap.isOpened():
-            self.cap.release()
+        if hasattr(self, "vision_worker"):
+            self._release_camera()
+
+    def __del__(self):
+        self.cleanup()
 
 
 if __name__ == "__main__":
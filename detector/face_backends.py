@@ -0,0 +1,295 @@
+"""
+Face detector backends — a small common interface over OpenCV's Haar
+cascade, OpenCV's YuNet ``FaceDetectorYN`` and MediaPipe face detection,
+plus an "auto" mode that benchmarks the available backends on the first
+few frames and keeps the fastest one that still finds the face.
+
+Every backend takes a BGR frame and returns ``[(x, y, w, h), ...]``.
+"""
+
+import os
+import threading
+import time
+
+import cv2
+
+# Project root (two levels up: project/detector/face_backends.py → project/)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(ROOT_DIR, "assets", "models")
+
+# Backend used by the tracker and the break screen: "haar", "yunet",
+# "mediapipe" or "auto". Override with the FACE_BACKEND environment variable.
+DEFAULT_BACKEND = os.environ.get("FACE_BACKEND", "haar")
+
+
+class FaceDetector:
+    """Common interface: ``detect(frame_bgr, min_size) -> [(x, y, w, h)]``."""
+
+    name = "base"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether this backend can be built here (library and model file present)."""
+        raise NotImplementedError
+
+    def detect(self, frame, min_size=(30, 30)) -> list:
+        raise NotImplementedError
+
+
+class HaarFaceDetector(FaceDetector):
+    name = "haar"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True   # The cascade ships with opencv-python
+
+    def __init__(self, scale_factor=1.1, min_neighbors=6, **_):
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.cascade = cv2.CascadeClassifier(
+            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        )
+
+    def detect(self, frame, min_size=(30, 30)) -> list:
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = self.cascade.detectMultiScale(
+            gray, scaleFactor=self.scale_factor,
+            minNeighbors=self.min_neighbors, minSize=min_size,
+        )
+        return [tuple(int(v) for v in face) for face in faces]
+
+
+class YuNetFaceDetector(FaceDetector):
+    name = "yunet"
+    MODEL_FILE = "face_detection_yunet_2023mar.onnx"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return os.path.exists(os.path.join(MODELS_DIR, cls.MODEL_FILE))
+
+    def __init__(self, score_threshold=0.7, model_path=None, **_):
+        model_path = model_path or os.path.join(MODELS_DIR, self.MODEL_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"YuNet model not found at {model_path}")
+        self.detector = cv2.FaceDetectorYN.create(
+            model_path, "", (320, 320), score_threshold=score_threshold
+        )
+        self._input_size = (320, 320)
+
+    def detect(self, frame, min_size=(30, 30)) -> list:
+        if frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        size = (frame.shape[1], frame.shape[0])
+        if size != self._input_size:
+            self.detector.setInputSize(size)
+            self._input_size = size
+        _, faces = self.detector.detect(frame)
+        if faces is None:
+            return []
+        boxes = [tuple(int(v) for v in face[:4]) for face in faces]
+        return [b for b in boxes if b[2] >= min_size[0] and b[3] >= min_size[1]]
+
+
+class MediaPipeFaceDetector(FaceDetector):
+    name = "mediapipe"
+    MODEL_FILE = "blaze_face_short_range.tflite"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import mediapipe as mp
+        except ImportError:
+            return False
+        return hasattr(mp, "solutions") or os.path.exists(os.path.join(MODELS_DIR, cls.MODEL_FILE))
+
+    def __init__(self, min_confidence=0.5, model_path=None, **_):
+        import mediapipe as mp
+
+        self._mp = mp
+        if hasattr(mp, "solutions"):
+            # Legacy solutions API — ships its own model.
+            self._solution = mp.solutions.face_detection.FaceDetection(
+                model_selection=0, min_detection_confidence=min_confidence
+            )
+            self._task = None
+        else:
+            from mediapipe.tasks.python import BaseOptions, vision
+
+            model_path = model_path or os.path.join(MODELS_DIR, self.MODEL_FILE)
+            if not os.path.exists(model_path):
+                raise FileNotFoundError(f"MediaPipe model not found at {model_path}")
+            options = vision.FaceDetectorOptions(
+                base_options=BaseOptions(model_asset_path=model_path),
+                min_detection_confidence=min_confidence,
+            )
+            self._task = vision.FaceDetector.create_from_options(options)
+            self._solution = None
+
+    def detect(self, frame, min_size=(30, 30)) -> list:
+        code = cv2.COLOR_GRAY2RGB if frame.ndim == 2 else cv2.COLOR_BGR2RGB
+        rgb = cv2.cvtColor(frame, code)
+        frame_h, frame_w = rgb.shape[:2]
+
+        boxes = []
+        if self._solution is not None:
+            results = self._solution.process(rgb)
+            for det in results.detections or []:
+                rel = det.location_data.relative_bounding_box
+                boxes.append((
+                    int(rel.xmin * frame_w), int(rel.ymin * frame_h),
+                    int(rel.width * frame_w), int(rel.height * frame_h),
+                ))
+        else:
+            image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=rgb)
+            for det in self._task.detect(image).detections:
+                bb = det.bounding_box
+                boxes.append((bb.origin_x, bb.origin_y, bb.width, bb.height))
+        return [b for b in boxes if b[2] >= min_size[0] and b[3] >= min_size[1]]
+
+
+BACKENDS = {
+    "haar": HaarFaceDetector,
+    "yunet": YuNetFaceDetector,
+    "mediapipe": MediaPipeFaceDetector,
+}
+
+
+class AutoFaceDetector(FaceDetector):
+    """
+    Behaves like Haar until ``warmup_frames`` full frames have been seen,
+    then times every available backend on those frames on a background
+    thread and swaps in the fastest one that found a face in at least
+    ``min_recall`` of them. Backends whose model files are missing are left
+    out; with Haar as the only one left there is nothing to compare and it is
+    used straight away. If no backend reaches that (e.g. nobody was in
+    front of the camera), new frames are sampled and the benchmark retried,
+    up to ``MAX_BENCHMARKS`` times before settling on Haar. The choice is
+    remembered for the rest of the session.
+    """
+
+    name = "auto"
+    WARMUP_FRAMES = 8
+    MIN_RECALL = 0.75           # Fraction of sample frames a backend must find the face in
+    MAX_BENCHMARKS = 3
+    CANDIDATES = ("yunet", "mediapipe", "haar")
+
+    _session_choice = None      # Backend name picked by the first successful benchmark
+    _lock = threading.Lock()    # One benchmark at a time across instances
+
+    def __init__(self, warmup_frames=WARMUP_FRAMES, min_recall=MIN_RECALL, **params):
+        self.params = params
+        self.warmup_frames = warmup_frames
+        self.min_recall = min_recall
+        self._samples = []
+        self._sample_shape = None   # Full-frame shape; smaller frames are ROI crops
+        self._benchmarks = 0
+        self._thread = None
+
+        self.candidates = available_backends(self.CANDIDATES)
+        if AutoFaceDetector._session_choice is not None:
+            self.active = create_face_detector(AutoFaceDetector._session_choice, **params)
+        elif self.candidates == ["haar"]:
+            print("Face backend auto-select: only haar is available "
+                  f"(no yunet/mediapipe models in {MODELS_DIR})")
+            AutoFaceDetector._session_choice = "haar"
+            self.active = HaarFaceDetector(**params)
+        else:
+            self.active = None
+            self._fallback = HaarFaceDetector(**params)
+
+    def detect(self, frame, min_size=(30, 30)) -> list:
+        active = self.active
+        if active is not None:
+            return active.detect(frame, min_size)
+
+        self._collect_sample(frame, min_size)
+        return self._fallback.detect(frame, min_size)
+
+    def _collect_sample(self, frame, min_size):
+        # Only benchmark on full frames: ROI searches also call detect() with
+        # crops, which would flatter slow backends and skew recall.
+        if self._thread is not None:
+            return
+        shape = frame.shape[:2]
+        largest = self._sample_shape
+        if largest is None or shape[0] * shape[1] > largest[0] * largest[1]:
+            self._sample_shape = shape
+            self._samples = []
+        elif shape != self._sample_shape:
+            return
+        self._samples.append((frame.copy(), min_size))
+        if len(self._samples) >= self.warmup_frames:
+            self._thread = threading.Thread(
+                target=self._benchmark, args=(self._samples,), daemon=True
+            )
+            self._samples = []
+            self._thread.start()
+
+    def _benchmark(self, samples):
+        """Background thread: pick a backend and swap it in."""
+        with AutoFaceDetector._lock:
+            choice = AutoFaceDetector._session_choice
+            if choice is not None:   # Another instance already decided
+                self.active = create_face_detector(choice, **self.params)
+                return
+            self._benchmarks += 1
+            detector = select_face_detector(
+                samples, self.candidates, self.min_recall, **self.params
+            )
+            if detector is None and self._benchmarks >= self.MAX_BENCHMARKS:
+                print("Face backend auto-select: no backend found the face reliably, keeping haar")
+                detector = self._fallback
+            if detector is not None:
+                AutoFaceDetector._session_choice = detector.name
+                self.active = detector
+        self._thread = None
+
+
+def available_backends(names=tuple(BACKENDS)) -> list:
+    """The backends among ``names`` that can actually be built here."""
+    return [name for name in names if BACKENDS[name].is_available()]
+
+
+def create_face_detector(name: str = DEFAULT_BACKEND, **params) -> FaceDetector:
+    """Build the backend called ``name`` ("haar", "yunet", "mediapipe" or "auto")."""
+    if name == "auto":
+        return AutoFaceDetector(**params)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown face detector backend: {name!r}")
+    return BACKENDS[name](**params)
+
+
+def select_face_detector(samples, candidates, min_recall, **params):
+    """
+    Benchmark ``candidates`` on ``samples`` (``(frame, min_size)`` pairs) and
+    return the fastest backend that found a face in at least ``min_recall``
+    of them, or ``None`` if none did. Unavailable backends are skipped.
+    """
+    results = []
+    for name in candidates:
+        try:
+            detector = create_face_detector(name, **params)
+            detector.detect(*samples[0])  # Warm-up: lazy allocations, JIT, etc.
+        except Exception as e:
+            print(f"Face backend {name} unavailable: {e}")
+            continue
+
+        hits = 0
+        start = time.perf_counter()
+        for frame, min_size in samples:
+            if detector.detect(frame, min_size):
+                hits += 1
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(samples)
+        results.append((detector, hits, elapsed_ms))
+
+    summary = ", ".join(
+        f"{d.name}: {ms:.1f} ms/frame, {h}/{len(samples)} hits" for d, h, ms in results
+    )
+    eligible = [r for r in results if r[1] >= len(samples) * min_recall]
+    if not eligible:
+        print(f"Face backend auto-select: no backend reached {min_recall:.0%} recall ({summary})")
+        return None
+
+    detector, hits, elapsed_ms = min(eligible, key=lambda r: r[2])
+    print(f"Face backend auto-select → {detector.name} ({summary})")
+    return detector
@@ -0,0 +1,219 @@
+"""
+Face search strategies — decide *where* and *how often* the face detector
+runs on each frame, and whether a cheap tracker follows the face in
+between. All strategies wrap a backend from ``face_backends`` and share
+``detect(frame) -> [(x, y, w, h)]`` so the focus tracker's face/no-face
+decision does not depend on which one is active.
+"""
+
+from contextlib import nullcontext
+
+import cv2
+
+
+class FullFrameSearch:
+    """Scan the whole frame at full resolution on every call."""
+
+    def __init__(self, detector, min_size=(100, 100)):
+        self.detector = detector
+        self.min_size = min_size
+
+        self.full_scans = 0
+
+    def detect(self, frame) -> list:
+        return self._full_scan(frame)
+
+    def _full_scan(self, frame) -> list:
+        self.full_scans += 1
+        return self.detector.detect(frame, self.min_size)
+
+
+class RoiFaceSearch(FullFrameSearch):
+    """
+    Search a padded window around the last known face on a downscaled
+    pyramid level first; fall back to a full-frame scan on a miss or every
+    ``full_scan_interval`` frames.
+    """
+
+    ROI_PADDING = 0.5         # Extra margin around the last box, as a fraction of its size
+    PYRAMID_SCALE = 0.5       # Downscale applied to the ROI before detection
+    FULL_SCAN_INTERVAL = 15   # Force a full-frame scan at least this often (frames)
+
+    def __init__(self, detector, full_scan_interval=FULL_SCAN_INTERVAL, **params):
+        super().__init__(detector, **params)
+        self.full_scan_interval = full_scan_interval
+        self.last_box = None
+        self.frames_since_full = 0
+
+        self.roi_hits = 0
+
+    def detect(self, frame) -> list:
+        self.frames_since_full += 1
+        if self.last_box is not None and self.frames_since_full < self.full_scan_interval:
+            faces = self._search_roi(frame)
+            if faces:
+                self.roi_hits += 1
+                self.last_box = max(faces, key=lambda f: f[2] * f[3])
+                return faces
+
+        faces = self._full_scan(frame)
+        self.frames_since_full = 0
+        self.last_box = max(faces, key=lambda f: f[2] * f[3]) if faces else None
+        return faces
+
+    def _search_roi(self, frame) -> list:
+        return search_around(
+            self.detector, frame, self.last_box, self.min_size,
+            self.ROI_PADDING, self.PYRAMID_SCALE,
+        )
+
+
+def search_around(detector, frame, box, min_size, padding, scale) -> list:
+    """
+    Run ``detector`` on a window around ``box`` (grown by ``padding`` × its
+    size on each side), downscaled by ``scale``; boxes in frame coordinates.
+    """
+    frame_h, frame_w = frame.shape[:2]
+    x, y, w, h = box
+    pad_x = int(w * padding)
+    pad_y = int(h * padding)
+    x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+    x1, y1 = min(frame_w, x + w + pad_x), min(frame_h, y + h + pad_y)
+    if x1 <= x0 or y1 <= y0:
+        return []
+
+    roi = cv2.resize(
+        frame[y0:y1, x0:x1], None, fx=scale, fy=scale,
+        interpolation=cv2.INTER_AREA,
+    )
+    min_size = (
+        max(1, int(min_size[0] * scale)),
+        max(1, int(min_size[1] * scale)),
+    )
+    faces = detector.detect(roi, min_size)
+    return [
+        (
+            x0 + int(fx / scale), y0 + int(fy / scale),
+            int(fw / scale), int(fh / scale),
+        )
+        for (fx, fy, fw, fh) in faces
+    ]
+
+
+class TrackingFaceSearch(FullFrameSearch):
+    """
+    Run the detector every ``detect_interval`` frames and follow the face
+    with a lightweight OpenCV contrib tracker (MOSSE/KCF) in between.
+    Trackers happily follow the background once the face has left, so every
+    tracked box is confirmed by a cheap detector pass on a downscaled window
+    around it; a miss, a tracker failure or an implausible box drops the
+    track and triggers an immediate full re-detection.
+    """
+
+    DETECT_INTERVAL = 10      # Re-run the detector at least this often (frames)
+    TRACKER_KIND = "MOSSE"    # "MOSSE" (fastest) or "KCF" (more robust)
+    MIN_SIZE_RATIO = 0.5      # Track dropped if it shrinks below this × min_size
+    VERIFY_PADDING = 0.25     # Margin around the tracked box searched to confirm it
+    VERIFY_SCALE = 0.5        # Downscale applied to that window before detection
+
+    def __init__(self, detector, detect_interval=DETECT_INTERVAL,
+                 tracker_kind=TRACKER_KIND, **params):
+        super().__init__(detector, **params)
+        self.detect_interval = detect_interval
+        self.tracker_kind = tracker_kind
+        self.tracker = None
+        self.frames_since_detect = 0
+
+        self.tracked_frames = 0
+        self.tracker_losses = 0
+
+        if _tracker_factory(tracker_kind) is None:
+            print(
+                f"Warning: OpenCV tracker {tracker_kind} unavailable "
+                "(install opencv-contrib-python); falling back to full scans."
+            )
+
+    def detect(self, frame) -> list:
+        self.frames_since_detect += 1
+        if self.tracker is not None and self.frames_since_detect < self.detect_interval:
+            faces = self._update_tracker(frame)
+            if faces:
+                self.tracked_frames += 1
+                return faces
+            self.tracker_losses += 1
+
+        faces = self._full_scan(frame)
+        self.frames_since_detect = 0
+        self.tracker = None
+        if faces:
+            self._start_tracker(frame, max(faces, key=lambda f: f[2] * f[3]))
+        return faces
+
+    def _start_tracker(self, frame, box):
+        factory = _tracker_factory(self.tracker_kind)
+        if factory is None:
+            return
+        tracker = factory()
+        if tracker.init(frame, box) is False:
+            return
+        self.tracker = tracker
+
+    def _update_tracker(self, frame) -> list:
+        """Faces confirmed around the tracked box; empty once the track is lost."""
+        ok, box = self.tracker.update(frame)
+        if not ok:
+            return []
+        x, y, w, h = (int(v) for v in box)
+        frame_h, frame_w = frame.shape[:2]
+        too_small = (
+            w < self.min_size[0] * self.MIN_SIZE_RATIO
+            or h < self.min_size[1] * self.MIN_SIZE_RATIO
+        )
+        off_frame = x + w <= 0 or y + h <= 0 or x >= frame_w or y >= frame_h
+        if too_small or off_frame:
+            return []
+        return search_around(
+            self.detector, frame, (x, y, w, h), self.min_size,
+            self.VERIFY_PADDING, self.VERIFY_SCALE,
+        )
+
+
+def process_frame(frame, face_search, timer=None):
+    """
+    The tracker's per-frame path: mirror the raw camera frame, convert it for
+    display and run the face search. Returns ``(frame_rgb, faces)``. Each
+    step is recorded on ``timer`` (a ``StageTimer``) when one is given.
+    """
+    stage = timer.stage if timer is not None else _untimed
+    with stage("flip"):
+        frame = cv2.flip(frame, 1)
+    with stage("cvt_rgb"):
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    with stage("detect"):
+        faces = face_search.detect(frame)
+    return frame_rgb, faces
+
+
+def _untimed(_name):
+    return nullcontext()
+
+
+def _tracker_factory(kind: str):
+    """Return the ``Tracker<kind>_create`` factory from cv2.legacy or cv2."""
+    name = f"Tracker{kind}_create"
+    for namespace in (getattr(cv2, "legacy", None), cv2):
+        factory = getattr(namespace, name, None)
+        if factory is not None:
+            return factory
+    return None
+
+
+def create_face_search(mode: str, detector, **params):
+    """Build the search strategy named by ``mode`` ("full", "roi" or "track")."""
+    if mode == "roi":
+        return RoiFaceSearch(detector, **params)
+    if mode == "track":
+        return TrackingFaceSearch(detector, **params)
+    if mode == "full":
+        return FullFrameSearch(detector, **params)
+    raise ValueError(f"Unknown face search mode: {mode!r}")
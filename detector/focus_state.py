@@ -0,0 +1,70 @@
+"""
+Focus state machine — the distraction logic behind the tracker, free of any
+Tk, audio or camera code so the windowed app, the headless runner and the
+replay harness all make identical decisions.
+"""
+
+# Tuneable constants
+DISTRACTION_THRESHOLD_S = 2.0  # Seconds without a face before "distracted"
+DISTRACTION_LIMIT = 5         # Total distractions before the challenge dialog
+SUS_AUDIO_DELAY_S = 0.7       # Seconds without a face before the "sus" audio cue
+MAX_TICK_S = 0.5              # Cap on the time credited to a single frame
+
+FOCUSED = "focused"
+LOOKING_AWAY = "looking_away"
+DISTRACTED = "distracted"
+LIMIT_REACHED = "limit_reached"
+
+
+class FocusStateMachine:
+    def __init__(self, threshold_s=DISTRACTION_THRESHOLD_S,
+                 sus_delay_s=SUS_AUDIO_DELAY_S, limit=DISTRACTION_LIMIT):
+        self.threshold = threshold_s
+        self.sus_delay = sus_delay_s
+        self.limit = limit
+
+        self.distraction_seconds = 0.0
+        self.is_currently_distracted = False
+        self.total_distractions = 0
+        self.limit_reached = False
+
+    @property
+    def state(self) -> str:
+        if self.limit_reached:
+            return LIMIT_REACHED
+        if self.is_currently_distracted:
+            return DISTRACTED
+        if self.distraction_seconds > 0:
+            return LOOKING_AWAY
+        return FOCUSED
+
+    def update(self, face_present: bool, dt: float) -> list:
+        """
+        Advance the machine by ``dt`` seconds and return the events that fired:
+        "sus_cue", "distracted", "distraction_ended" and/or "limit_reached".
+        """
+        events = []
+        if face_present:
+            if self.is_currently_distracted:
+                self.total_distractions += 1
+                self.is_currently_distracted = False
+                events.append("distraction_ended")
+
+            if self.distraction_seconds > 0:
+                # Focus recovers twice as fast as it is lost.
+                self.distraction_seconds = max(0.0, self.distraction_seconds - 2 * dt)
+
+            if self.total_distractions >= self.limit and not self.limit_reached:
+                self.limit_reached = True
+                events.append("limit_reached")
+        else:
+            previous = self.distraction_seconds
+            self.distraction_seconds += dt
+
+            if previous < self.sus_delay <= self.distraction_seconds:
+                events.append("sus_cue")
+
+            if self.distraction_seconds >= self.threshold and not self.is_currently_distracted:
+                self.is_currently_distracted = True
+                events.append("distracted")
+        return events
@@ -0,0 +1,96 @@
+"""
+Frame grabber — background capture thread that keeps reading from a
+``cv2.VideoCapture`` into a single-slot "latest frame wins" buffer, so slow
+camera reads never block the Tk main loop.
+
+With a decode interval set, the thread still ``grab()``s every frame (which
+keeps the driver queue fresh) but only ``retrieve()``s — decodes — one per
+interval.
+"""
+
+import threading
+import time
+
+
+class FrameGrabber:
+    READ_FAIL_BACKOFF_S = 0.05   # Pause after a failed read before retrying
+
+    def __init__(self, cap, timer=None):
+        self.cap = cap
+        self.timer = timer       # Optional StageTimer; records the "read" stage
+        self.is_running = False
+        self.thread = None
+        self.decode_interval = 0.0  # Seconds between decoded frames (0 = every frame)
+
+        self._lock = threading.Lock()
+        self._frame = None       # Single slot: newest frame not yet consumed
+
+        self.frames_captured = 0
+        self.frames_dropped = 0  # Frames overwritten before anyone consumed them
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self, release=True):
+        """Stop the capture thread and (optionally) release the device."""
+        self.is_running = False
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.thread = None
+        if release and self.cap is not None and self.cap.isOpened():
+            self.cap.release()
+
+    # ------------------------------------------------------------------
+    # Consumer API
+    # ------------------------------------------------------------------
+
+    def latest(self):
+        """Return the newest unseen frame, or ``None`` if nothing new arrived."""
+        with self._lock:
+            frame = self._frame
+            self._frame = None
+        return frame
+
+    def set_interval(self, seconds: float):
+        self.decode_interval = seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "captured": self.frames_captured,
+                "dropped": self.frames_dropped,
+            }
+
+    # ------------------------------------------------------------------
+    # Capture loop (background thread)
+    # ------------------------------------------------------------------
+
+    def _capture_loop(self):
+        last_decode = 0.0
+        while self.is_running:
+            start = time.perf_counter()
+            if not self.cap.grab():
+                time.sleep(self.READ_FAIL_BACKOFF_S)
+                continue
+            now = time.monotonic()
+            if now - last_decode < self.decode_interval:
+                continue
+            success, frame = self.cap.retrieve()
+            if not success:
+                continue
+            last_decode = now
+            if self.timer is not None:
+                self.timer.record("read", (time.perf_counter() - start) * 1000)
+            with self._lock:
+                if self._frame is not None:
+                    self.frames_dropped += 1
+                self._frame = frame
+                self.frames_captured += 1
@@ -0,0 +1,246 @@
+"""
+GIF frames — decodes animated GIFs with their real per-frame durations and
+aspect-preserving downscaling. Frames that already fit stay
+palette-indexed ("P" mode, 1 byte/pixel); frames that need resizing are
+expanded to RGBA, or with ``quantize=True`` reduced back to 256 colours
+(alpha kept). Decoding is a generator, so callers can stream frames instead
+of holding the whole animation (GifStream does that on a background thread).
+
+Usage (open-time / memory comparison of eager vs. streamed loading):
+    python -m detector.gif_frames some.gif [--size 300x250]
+"""
+
+import argparse
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from PIL import GifImagePlugin, Image, ImageTk
+
+DEFAULT_DURATION_MS = 100     # Used for missing or ≤ 10 ms delays, as browsers do
+MIN_DURATION_MS = 20          # Floor for the remaining very short delays
+
+
+def frame_duration(duration) -> int:
+    if not duration or duration <= 10:
+        return DEFAULT_DURATION_MS
+    return max(MIN_DURATION_MS, int(duration))
+
+
+def fit_frame(frame, max_size, quantize=False):
+    """
+    Downscale ``frame`` to fit ``max_size`` keeping its aspect ratio. Resized
+    frames are RGBA, or palette-indexed again with ``quantize`` (a quarter of
+    the memory, ~2 ms of FASTOCTREE per frame).
+    """
+    if max_size is None or (frame.width <= max_size[0] and frame.height <= max_size[1]):
+        return frame
+    frame = frame.convert("RGBA")
+    frame.thumbnail(max_size, Image.Resampling.LANCZOS)
+    return frame.quantize(method=Image.Quantize.FASTOCTREE) if quantize else frame
+
+
+def frame_bytes(frame) -> int:
+    return frame.width * frame.height * len(frame.getbands())
+
+
+_strategy_lock = threading.Lock()
+
+
+@contextmanager
+def _palette_frames():
+    """
+    Keep later frames palette-indexed unless their palette differs from the
+    first one (Pillow's default expands every frame after the first to
+    RGB/RGBA). Pillow only has a module-wide setting for this, read on every
+    seek, so it is switched on just around our own seeks and then restored.
+    """
+    if not hasattr(GifImagePlugin, "LoadingStrategy"):
+        yield
+        return
+    with _strategy_lock:
+        previous = GifImagePlugin.LOADING_STRATEGY
+        GifImagePlugin.LOADING_STRATEGY = GifImagePlugin.LoadingStrategy.RGB_AFTER_DIFFERENT_PALETTE_ONLY
+        try:
+            yield
+        finally:
+            GifImagePlugin.LOADING_STRATEGY = previous
+
+
+def iter_gif_frames(path: str, max_size=None, quantize=False):
+    """Yield ``(frame, duration_ms)`` for each frame of the GIF at ``path``."""
+    with Image.open(path) as gif:
+        with _palette_frames():
+            n_frames = getattr(gif, "n_frames", 1)
+        for index in range(n_frames):
+            with _palette_frames():
+                gif.seek(index)
+                frame = gif.copy()
+                frame.load()
+            duration = frame_duration(gif.info.get("duration"))
+            yield fit_frame(frame, max_size, quantize), duration
+
+
+class GifSequence:
+    """A fully decoded animation: PIL frames plus their display durations."""
+
+    def __init__(self, frames, durations):
+        self.frames = frames
+        self.durations = durations
+        self.photos = [None] * len(frames)   # PhotoImages, built lazily on the Tk thread
+
+    def photo(self, index: int):
+        """PhotoImage for frame ``index``; Tk thread only. Built on first use and kept."""
+        photo = self.photos[index]
+        if photo is None:
+            photo = self.photos[index] = ImageTk.PhotoImage(self.frames[index])
+        return photo
+
+    @property
+    def total_ms(self) -> int:
+        return sum(self.durations)
+
+
+def load_gif(path: str, max_size=None) -> GifSequence:
+    frames, durations = [], []
+    for frame, duration in iter_gif_frames(path, max_size):
+        frames.append(frame)
+        durations.append(duration)
+    return GifSequence(frames, durations)
+
+
+class GifStream:
+    """
+    Decodes a GIF on a background thread. The first frame is available as
+    soon as it is decoded and at most ``window`` frames are queued ahead of
+    the consumer. If the whole animation fits in ``memory_budget`` bytes it
+    is kept after the first pass and looped without re-decoding; otherwise
+    the decoder keeps streaming it from disk.
+    """
+
+    WINDOW = 8                            # Frames decoded ahead of the consumer
+    MEMORY_BUDGET = 16 * 1024 * 1024      # Bytes of frames kept for looping
+
+    def __init__(self, path: str, max_size=None, window=WINDOW, memory_budget=MEMORY_BUDGET):
+        self.path = path
+        self.max_size = max_size
+        self.memory_budget = memory_budget
+        self._queue: queue.Queue = queue.Queue(maxsize=window)
+
+        self.is_running = False
+        self.thread = None
+        self.error = None             # Set if decoding failed; the stream is then dead
+        self.frames = None            # Whole animation, once known to fit the budget
+        self._loop_index = 0
+
+        self.frames_decoded = 0
+        self.first_frame_ms = None    # Time from start() to the first decoded frame
+
+    def start(self):
+        self.is_running = True
+        self._start_time = time.perf_counter()
+        self.thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.is_running = False
+
+    @property
+    def failed(self) -> bool:
+        """True once decoding has failed and no more frames will come."""
+        return self.error is not None and self._queue.empty()
+
+    def next_frame(self):
+        """Return the next ``(frame, duration_ms)``, or ``None`` if none is decoded yet."""
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        # The queue only runs dry for good once the decoder has finished a
+        # pass that fit the budget; from then on loop over the kept frames.
+        if self.frames is not None and not self.thread.is_alive():
+            item = self.frames[self._loop_index]
+            self._loop_index = (self._loop_index + 1) % len(self.frames)
+            return item
+        return None
+
+    def held_bytes(self) -> int:
+        """Approximate bytes of decoded frames currently held (kept + queued)."""
+        held = list(self._queue.queue) + (self.frames or [])
+        return sum(frame_bytes(frame) for frame, _ in held)
+
+    def _put(self, item) -> bool:
+        while self.is_running:
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _decode_loop(self):
+        try:
+            while self.is_running:
+                kept, kept_bytes = [], 0
+                for item in iter_gif_frames(self.path, self.max_size, quantize=True):
+                    if self.first_frame_ms is None:
+                        self.first_frame_ms = (time.perf_counter() - self._start_time) * 1000
+                    self.frames_decoded += 1
+                    if kept is not None:
+                        kept_bytes += frame_bytes(item[0])
+                        if kept_bytes <= self.memory_budget:
+                            kept.append(item)
+                        else:
+                            kept = None
+                    if not self._put(item):
+                        return
+                if kept:
+                    self.frames = kept
+                    return
+        except Exception as e:
+            print(f"Error decoding GIF {self.path}: {e}")
+            self.error = e
+            self.is_running = False
+
+
+def _benchmark(path: str, max_size):
+    # "Before": BreakApp's original loader decoded every frame to RGBA and
+    # resized it up front (PhotoImage creation excluded, it needs a display).
+    start = time.perf_counter()
+    eager = []
+    with Image.open(path) as gif:
+        for index in range(getattr(gif, "n_frames", 1)):
+            gif.seek(index)
+            eager.append(gif.copy().convert("RGBA").resize(max_size, Image.Resampling.LANCZOS))
+    eager_ms = (time.perf_counter() - start) * 1000
+    eager_bytes = sum(frame_bytes(frame) for frame in eager)
+    print(f"eager    first frame after {eager_ms:7.1f} ms, "
+          f"{eager_bytes / 1e6:6.2f} MB held ({len(eager)} frames)")
+
+    stream = GifStream(path, max_size)
+    stream.start()
+    while stream.next_frame() is None:
+        time.sleep(0.001)
+    first_ms = (time.perf_counter() - stream._start_time) * 1000
+    # Play one loop at the GIF's own speed, sampling what the stream holds.
+    peak = 0
+    for _ in range(len(eager)):
+        item = stream.next_frame()
+        while item is None:
+            time.sleep(0.001)
+            item = stream.next_frame()
+        peak = max(peak, stream.held_bytes())
+        time.sleep(item[1] / 1000)
+    stream.stop()
+    looping = "kept for looping" if stream.frames is not None else "streamed from disk"
+    print(f"streamed first frame after {first_ms:7.1f} ms, "
+          f"{peak / 1e6:6.2f} MB peak held ({looping})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare eager vs. streamed GIF loading")
+    parser.add_argument("gif")
+    parser.add_argument("--size", default="300x250", help="Max frame size, WxH")
+    args = parser.parse_args()
+    _benchmark(args.gif, tuple(int(v) for v in args.size.split("x")))
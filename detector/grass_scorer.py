@@ -0,0 +1,378 @@
+"""
+Grass scorer — "is this a photo of grass?" engines for the challenge wheel,
+built on CLIP. The zero-shot pipeline re-tokenises and re-encodes the same
+two label prompts for every picture; the engines here encode the prompts
+once, cache the normalised text embeddings on disk, and only run the image
+tower per request:
+
+    pipeline   the original transformers zero-shot pipeline (reference)
+    fp32       CLIP vision tower in PyTorch
+    int8       the same with dynamically int8-quantised Linear layers
+    onnx       vision tower exported to ONNX, run by ONNX Runtime on CPU
+    onnx-int8  the ONNX graph with int8-quantised weights
+
+Pick one with GRASS_ENGINE. Models are only read from the local Hugging Face
+cache (or a local directory given as GRASS_MODEL) — nothing is downloaded at
+run time; fetch the model once with ``--download``. Every engine returns the
+grass probability in [0, 1].
+
+    python -m detector.grass_scorer --download
+    python -m detector.grass_scorer photos/ --engines fp32,int8,onnx
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+
+import numpy as np
+from PIL import Image
+
+from .stage_timer import percentile
+
+# Hub id (must already be in the local cache) or a local model directory.
+MODEL_NAME = os.environ.get("GRASS_MODEL", "openai/clip-vit-base-patch32")
+DEFAULT_ENGINE = os.environ.get("GRASS_ENGINE", "pipeline")  # Until the others are benchmarked
+GRASS_LABELS = ("grass", "not grass")     # The first label is the one scored
+PROMPT_TEMPLATE = "This is a photo of {}."  # Same template as the zero-shot pipeline
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "anti-doomscroll")
+IMAGE_EXT = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+DOWNLOAD_PATTERNS = ("*.json", "*.txt", "*.safetensors")   # Config, tokenizer, PyTorch weights
+
+
+def _cache_path(model_name, suffix) -> str:
+    slug = re.sub(r"[^\w.-]+", "_", model_name.strip("/\\"))
+    return os.path.join(CACHE_DIR, f"grass_{slug}{suffix}")
+
+
+# ----------------------------------------------------------------------
+# Text embeddings
+# ----------------------------------------------------------------------
+
+def load_text_embeddings(model_name=MODEL_NAME, cache_path=None):
+    """
+    Return ``(text_embeds, logit_scale)`` for GRASS_LABELS: L2-normalised
+    float32 rows plus CLIP's learned temperature. Computed with the full
+    model once, then read back from the on-disk cache.
+    """
+    cache_path = cache_path or _cache_path(model_name, "_text.npz")
+    key = "|".join((model_name, PROMPT_TEMPLATE, *GRASS_LABELS))
+    if os.path.exists(cache_path):
+        try:
+            data = np.load(cache_path)
+            if str(data["key"]) == key:
+                return data["text_embeds"], float(data["logit_scale"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error reading text embedding cache {cache_path}: {e}")
+
+    import torch
+    from transformers import CLIPModel, CLIPTokenizer
+
+    start = time.perf_counter()
+    model = CLIPModel.from_pretrained(model_name, local_files_only=True).eval()
+    tokenizer = CLIPTokenizer.from_pretrained(model_name, local_files_only=True)
+    prompts = [PROMPT_TEMPLATE.format(label) for label in GRASS_LABELS]
+    inputs = tokenizer(prompts, padding=True, return_tensors="pt")
+    with torch.inference_mode():
+        features = model.get_text_features(**inputs)
+    # transformers 5 returns an output object with the projected embeddings
+    # as its pooler_output; 4.x returns the tensor itself.
+    embeds = getattr(features, "pooler_output", features)
+    embeds = (embeds / embeds.norm(dim=-1, keepdim=True)).numpy().astype(np.float32)
+    logit_scale = float(model.logit_scale.exp())
+    print(f"Grass scorer: text embeddings computed in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, key=key, text_embeds=embeds, logit_scale=logit_scale)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Error writing text embedding cache {cache_path}: {e}")
+    return embeds, logit_scale
+
+
+def grass_probability(image_embeds, text_embeds, logit_scale) -> float:
+    """Softmax over the label prompts, as the zero-shot pipeline computes it."""
+    image_embeds = image_embeds / np.linalg.norm(image_embeds)
+    logits = logit_scale * (text_embeds @ image_embeds)
+    probs = np.exp(logits - logits.max())
+    return float(probs[0] / probs.sum())
+
+
+# ----------------------------------------------------------------------
+# Engines
+# ----------------------------------------------------------------------
+
+class GrassScorer:
+    """Common interface: ``score(image) -> grass probability``."""
+
+    name = "base"
+
+    def score(self, image) -> float:
+        raise NotImplementedError
+
+
+class PipelineGrassScorer(GrassScorer):
+    name = "pipeline"
+
+    def __init__(self, model_name=MODEL_NAME, **_):
+        from transformers import CLIPModel, CLIPProcessor, pipeline
+
+        processor = CLIPProcessor.from_pretrained(model_name, local_files_only=True)
+        self.classifier = pipeline(
+            "zero-shot-image-classification",
+            model=CLIPModel.from_pretrained(model_name, local_files_only=True),
+            tokenizer=processor.tokenizer,
+            image_processor=processor.image_processor,
+        )
+
+    def score(self, image) -> float:
+        results = self.classifier(
+            image, candidate_labels=list(GRASS_LABELS), hypothesis_template=PROMPT_TEMPLATE
+        )
+        return next(
+            (item["score"] for item in results if item["label"] == GRASS_LABELS[0]), 0.0
+        )
+
+
+class ClipGrassScorer(GrassScorer):
+    name = "fp32"
+    QUANTIZE = False
+
+    def __init__(self, model_name=MODEL_NAME, **_):
+        import torch
+        from transformers import CLIPImageProcessor, CLIPVisionModelWithProjection
+
+        self.text_embeds, self.logit_scale = load_text_embeddings(model_name)
+        self.processor = CLIPImageProcessor.from_pretrained(model_name, local_files_only=True)
+        model = CLIPVisionModelWithProjection.from_pretrained(
+            model_name, local_files_only=True
+        ).eval()
+        if self.QUANTIZE:
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self.model = model
+        self._torch = torch
+
+    def score(self, image) -> float:
+        pixels = self.processor(images=image.convert("RGB"), return_tensors="pt")["pixel_values"]
+        with self._torch.inference_mode():
+            image_embeds = self.model(pixel_values=pixels).image_embeds[0].numpy()
+        return grass_probability(image_embeds, self.text_embeds, self.logit_scale)
+
+
+class Int8GrassScorer(ClipGrassScorer):
+    name = "int8"
+    QUANTIZE = True
+
+
+class OnnxGrassScorer(GrassScorer):
+    name = "onnx"
+    QUANTIZE = False
+
+    def __init__(self, model_name=MODEL_NAME, onnx_path=None, **_):
+        import onnxruntime as ort
+        from transformers import CLIPImageProcessor
+
+        self.text_embeds, self.logit_scale = load_text_embeddings(model_name)
+        self.processor = CLIPImageProcessor.from_pretrained(model_name, local_files_only=True)
+
+        onnx_path = onnx_path or _cache_path(model_name, "_vision.onnx")
+        if not os.path.exists(onnx_path):
+            export_vision_onnx(model_name, onnx_path)
+        if self.QUANTIZE:
+            onnx_path = quantize_onnx(onnx_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            onnx_path, options, providers=["CPUExecutionProvider"]
+        )
+
+    def score(self, image) -> float:
+        pixels = self.processor(images=image.convert("RGB"), return_tensors="np")["pixel_values"]
+        image_embeds = self.session.run(
+            ["image_embeds"], {"pixel_values": pixels.astype(np.float32)}
+        )[0][0]
+        return grass_probability(image_embeds, self.text_embeds, self.logit_scale)
+
+
+class OnnxInt8GrassScorer(OnnxGrassScorer):
+    name = "onnx-int8"
+    QUANTIZE = True
+
+
+ENGINES = {
+    cls.name: cls
+    for cls in (PipelineGrassScorer, ClipGrassScorer, Int8GrassScorer,
+                OnnxGrassScorer, OnnxInt8GrassScorer)
+}
+
+
+def create_grass_scorer(name=DEFAULT_ENGINE, **params) -> GrassScorer:
+    if name not in ENGINES:
+        raise ValueError(f"Unknown grass scoring engine: {name!r}")
+    return ENGINES[name](**params)
+
+
+def export_vision_onnx(model_name, onnx_path):
+    """Export CLIP's vision tower + projection (``pixel_values`` → ``image_embeds``)."""
+    import torch
+    from transformers import CLIPVisionModelWithProjection
+
+    start = time.perf_counter()
+    model = CLIPVisionModelWithProjection.from_pretrained(
+        model_name, local_files_only=True
+    ).eval()
+
+    class ImageEmbeds(torch.nn.Module):
+        def __init__(self, vision):
+            super().__init__()
+            self.vision = vision
+
+        def forward(self, pixel_values):
+            return self.vision(pixel_values=pixel_values).image_embeds
+
+    size = model.config.image_size
+    os.makedirs(os.path.dirname(onnx_path), exist_ok=True)
+    tmp_path = onnx_path + ".tmp"
+    torch.onnx.export(
+        ImageEmbeds(model), torch.zeros(1, 3, size, size), tmp_path,
+        input_names=["pixel_values"], output_names=["image_embeds"],
+        dynamic_axes={"pixel_values": {0: "batch"}, "image_embeds": {0: "batch"}},
+        opset_version=17,
+        dynamo=False,   # The TorchScript exporter: dynamic_axes, no onnxscript needed
+    )
+    os.replace(tmp_path, onnx_path)
+    print(f"Grass scorer: exported {onnx_path} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def quantize_onnx(onnx_path) -> str:
+    """Return an int8-weight copy of ``onnx_path``, creating it on first use."""
+    quantized_path = onnx_path.replace(".onnx", "_int8.onnx")
+    if not os.path.exists(quantized_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(onnx_path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+def download_model(model_name=MODEL_NAME) -> str:
+    """One-time setup: fetch the model into the local Hugging Face cache."""
+    from huggingface_hub import snapshot_download
+
+    start = time.perf_counter()
+    path = snapshot_download(model_name, allow_patterns=list(DOWNLOAD_PATTERNS))
+    print(f"Grass scorer: {model_name} cached at {path} "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return path
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+
+def _load_images(sources) -> list:
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths += sorted(
+                os.path.join(source, name) for name in os.listdir(source)
+                if name.lower().endswith(IMAGE_EXT)
+            )
+        else:
+            paths.append(source)
+    return [(path, Image.open(path).convert("RGB")) for path in paths]
+
+
+def benchmark(images, engines, reference="pipeline") -> list:
+    """
+    Time each engine on ``images`` and compare its scores with the
+    ``reference`` engine: same grass/not-grass decision, and mean |Δscore|.
+    """
+    reports = []
+    reference_scores = None
+    for name in [reference] + [e for e in engines if e != reference]:
+        try:
+            start = time.perf_counter()
+            scorer = create_grass_scorer(name)
+            load_ms = (time.perf_counter() - start) * 1000
+            scorer.score(images[0][1])   # Warm-up
+        except Exception as e:
+            print(f"Grass engine {name} unavailable: {e}")
+            continue
+
+        scores, latencies_ms = [], []
+        for _, image in images:
+            start = time.perf_counter()
+            scores.append(scorer.score(image))
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+        if reference_scores is None and name == reference:
+            reference_scores = scores
+
+        report = {
+            "engine": name,
+            "images": len(images),
+            "load_ms": round(load_ms, 1),
+            "latency_ms": {
+                "mean": round(sum(latencies_ms) / len(latencies_ms), 2),
+                "p50": round(percentile(latencies_ms, 50), 2),
+                "p95": round(percentile(latencies_ms, 95), 2),
+            },
+            "scores": [round(s, 4) for s in scores],
+        }
+        if reference_scores is not None:
+            pairs = list(zip(scores, reference_scores))
+            report["agreement"] = sum((a > 0.5) == (b > 0.5) for a, b in pairs) / len(pairs)
+            report["mean_abs_diff"] = round(sum(abs(a - b) for a, b in pairs) / len(pairs), 4)
+        reports.append(report)
+        _print_report(report)
+    return reports
+
+
+def _print_report(report: dict):
+    lat = report["latency_ms"]
+    line = (
+        f"{report['engine']:>10}  load {report['load_ms']:>8.0f} ms  "
+        f"mean {lat['mean']:>7.2f} ms  p50 {lat['p50']:>7.2f} ms  p95 {lat['p95']:>7.2f} ms"
+    )
+    if "agreement" in report:
+        line += (f"  agreement {report['agreement'] * 100:5.1f}%"
+                 f"  |Δscore| {report['mean_abs_diff']:.4f}")
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark grass scoring engines")
+    parser.add_argument("images", nargs="*", help="Image files or directories")
+    parser.add_argument("--download", action="store_true",
+                        help=f"Fetch {MODEL_NAME} into the local cache (one-time setup)")
+    parser.add_argument("--engines", default="fp32,int8,onnx,onnx-int8",
+                        help="Comma-separated: " + ",".join(ENGINES))
+    parser.add_argument("--reference", default="pipeline",
+                        help="Engine the others are compared against")
+    parser.add_argument("--json", help="Write all reports to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.download:
+        download_model()
+        if not args.images:
+            return
+    images = _load_images(args.images)
+    if not images:
+        parser.error("no images found")
+    reports = benchmark(images, args.engines.split(","), args.reference)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
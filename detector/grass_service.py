@@ -0,0 +1,115 @@
+"""
+Grass service — hosts the CLIP "is this grass?" scorer (see
+grass_scorer.py) on one long-lived background thread for the whole app
+session. The model (and the transformers import itself) loads once, lazily
+on the first ``start()`` or ahead of time when the tracker sees the
+distraction limit coming, followed by a warm-up inference so the first real
+picture doesn't pay for lazy initialisation. Screens submit images with
+``classify()`` and get a ``concurrent.futures.Future`` back, so the Tk
+thread never blocks.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from PIL import Image
+
+from .grass_scorer import DEFAULT_ENGINE, create_grass_scorer
+
+WARMUP_SIZE = (224, 224)                # CLIP's input resolution
+
+
+class GrassService:
+    def __init__(self, engine=DEFAULT_ENGINE):
+        self.engine = engine
+        self._requests: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._scorer = None
+
+        self.ready = threading.Event()   # Set once loading finished (or failed)
+        self.load_error = None
+        self.load_ms = None
+        self.warmup_ms = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Begin loading the model in the background; later calls do nothing."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.ready.is_set() and self.load_error is None
+
+    def classify(self, image) -> Future:
+        """
+        Queue ``image`` (PIL) for scoring. The future resolves to the grass
+        probability in [0, 1], or raises if the model could not be loaded.
+        """
+        self.start()
+        future = Future()
+        self._requests.put((image, future, time.perf_counter()))
+        return future
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+
+    def _worker(self):
+        self._load()
+        while True:
+            image, future, queued_at = self._requests.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            if self.load_error is not None:
+                future.set_exception(self.load_error)
+                continue
+            start = time.perf_counter()
+            try:
+                future.set_result(self._scorer.score(image))
+            except Exception as e:
+                print(f"Error classifying image: {e}")
+                future.set_exception(e)
+                continue
+            done = time.perf_counter()
+            print(f"Grass model: request {(done - queued_at) * 1000:.0f} ms "
+                  f"({(start - queued_at) * 1000:.0f} ms queued, "
+                  f"{(done - start) * 1000:.0f} ms inference)")
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            self._scorer = create_grass_scorer(self.engine)
+            self.load_ms = (time.perf_counter() - start) * 1000
+            print(f"Grass model: {self.engine} engine loaded in {self.load_ms:.0f} ms")
+
+            start = time.perf_counter()
+            self._scorer.score(Image.new("RGB", WARMUP_SIZE))
+            self.warmup_ms = (time.perf_counter() - start) * 1000
+            print(f"Grass model: warm-up inference {self.warmup_ms:.0f} ms")
+        except Exception as e:
+            print(f"Error loading grass model ({self.engine} engine): {e}")
+            print("  First run? Fetch the model with: python -m detector.grass_scorer --download")
+            self.load_error = e
+        finally:
+            self.ready.set()
+
+
+_service = None
+
+
+def get_grass_service() -> GrassService:
+    """Return the process-wide grass classifier service."""
+    global _service
+    if _service is None:
+        _service = GrassService()
+    return _service
@@ -0,0 +1,201 @@
+"""
+Headless detector — runs capture, face detection and the distraction state
+machine without any Tk widgets, and emits focus state changes as JSON lines
+on stdout or a Unix socket. Intended for kiosk deployments that only need
+the focus decisions, not the preview.
+
+Usage:
+    python -m detector.headless [--camera 0] [--socket /tmp/focus.sock]
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+import cv2
+
+from .camera_probe import open_capture, parse_source
+from .face_backends import DEFAULT_BACKEND, create_face_detector
+from .face_search import create_face_search
+from .focus_state import LIMIT_REACHED, MAX_TICK_S, FocusStateMachine
+from .frame_grabber import FrameGrabber
+from .power_mode import AdaptiveFrameRate
+
+
+class JsonLineEmitter:
+    """Write one JSON object per line to a text stream."""
+
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+
+    def emit(self, event: dict):
+        self.stream.write(json.dumps(event) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class UnixSocketEmitter:
+    """Serve JSON lines to every client connected to a Unix socket."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen()
+
+        self._lock = threading.Lock()
+        self.clients: list = []
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def emit(self, event: dict):
+        data = (json.dumps(event) + "\n").encode()
+        with self._lock:
+            for client in self.clients[:]:
+                try:
+                    client.sendall(data)
+                except OSError:
+                    self.clients.remove(client)
+                    client.close()
+
+    def close(self):
+        self.server.close()
+        with self._lock:
+            for client in self.clients:
+                client.close()
+            self.clients.clear()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _accept_loop(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.clients.append(client)
+
+
+class HeadlessDetector:
+    IDLE_POLL_S = 0.005          # Sleep while waiting for the capture thread
+    FIRST_FRAME_TIMEOUT_S = 5.0  # A camera that opens but never delivers a frame is an error
+
+    def __init__(self, camera, emitter, detection_mode="roi", backend=DEFAULT_BACKEND):
+        self.camera = camera
+        self.emitter = emitter
+        self.is_running = False
+
+        detector = create_face_detector(backend, scale_factor=1.1, min_neighbors=6)
+        self.face_search = create_face_search(detection_mode, detector, min_size=(100, 100))
+        self.focus = FocusStateMachine()
+        self.frame_rate = AdaptiveFrameRate()
+
+    def run(self):
+        """
+        Block until stopped or the distraction limit is reached. Raises
+        ``RuntimeError`` (after emitting an ``error`` event, and before any
+        state) if the camera can't be opened or delivers no frames.
+        """
+        cap = open_capture(self.camera)
+        if not cap.isOpened():
+            cap.release()
+            self._fail(f"Cannot open camera {self.camera}")
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        grabber = FrameGrabber(cap)
+        grabber.start()
+
+        self.is_running = True
+        try:
+            # The initial "focused" state is only announced once frames flow.
+            deadline = time.monotonic() + self.FIRST_FRAME_TIMEOUT_S
+            while grabber.frames_captured == 0:
+                if not self.is_running:
+                    return
+                if time.monotonic() >= deadline:
+                    self._fail(f"No frames from camera {self.camera}")
+                time.sleep(self.IDLE_POLL_S)
+
+            state = self.focus.state
+            self._emit_state(state, None)
+            last_tick = None
+            while self.is_running:
+                frame = grabber.latest()
+                if frame is None:
+                    time.sleep(self.IDLE_POLL_S)
+                    continue
+
+                # No flip, colour conversion or drawing: only the decision matters.
+                face_present = bool(self.face_search.detect(frame))
+
+                now = time.monotonic()
+                dt = 0.0 if last_tick is None else min(now - last_tick, MAX_TICK_S)
+                last_tick = now
+                self.focus.update(face_present, dt)
+
+                if self.focus.state != state:
+                    self._emit_state(self.focus.state, state)
+                    state = self.focus.state
+                if state == LIMIT_REACHED:
+                    break
+
+                was_idle = self.frame_rate.is_idle
+                focused = face_present and self.focus.distraction_seconds == 0
+                interval_ms = self.frame_rate.update(focused, now)
+                if self.frame_rate.is_idle != was_idle:
+                    grabber.set_interval(interval_ms / 1000 * 0.9 if self.frame_rate.is_idle else 0.0)
+                time.sleep(interval_ms / 1000)
+        finally:
+            self.is_running = False
+            grabber.stop()
+
+    def stop(self):
+        self.is_running = False
+
+    def _fail(self, message):
+        self.emitter.emit({"event": "error", "message": message, "timestamp": time.time()})
+        raise RuntimeError(message)
+
+    def _emit_state(self, state, previous):
+        self.emitter.emit({
+            "event": "state",
+            "state": state,
+            "previous": previous,
+            "timestamp": time.time(),
+            "distraction_seconds": round(self.focus.distraction_seconds, 3),
+            "total_distractions": self.focus.total_distractions,
+        })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless focus detector")
+    parser.add_argument("--camera", default="0", help="Camera index or video file path (played as a looping virtual camera)")
+    parser.add_argument("--socket", help="Serve events on this Unix socket instead of stdout")
+    parser.add_argument("--mode", default="roi", choices=["full", "roi", "track"])
+    parser.add_argument("--backend", default=DEFAULT_BACKEND)
+    args = parser.parse_args(argv)
+
+    camera = parse_source(args.camera)
+    emitter = UnixSocketEmitter(args.socket) if args.socket else JsonLineEmitter()
+    detector = HeadlessDetector(camera, emitter, args.mode, args.backend)
+    try:
+        detector.run()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        emitter.close()
+
+
+if __name__ == "__main__":
+    main()
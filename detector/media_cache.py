@@ -0,0 +1,165 @@
+"""
+Media cache — decodes and downscales the Punisher's upcoming popup images
+(and animated GIF sequences) on a background worker into a bounded
+in-memory LRU cache, so opening a popup on the Tk thread is just wrapping
+ready pixels in a PhotoImage.
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+from PIL import Image
+
+from .gif_frames import frame_bytes, load_gif
+
+
+class ImagePrefetcher:
+    CAPACITY = 8              # Decoded images kept in memory
+    MEMORY_BUDGET = None      # Optional byte limit on top of the entry count
+
+    def __init__(self, max_size=(400, 400), capacity=CAPACITY, memory_budget=MEMORY_BUDGET):
+        self.max_size = max_size
+        self.capacity = capacity
+        self.memory_budget = memory_budget
+
+        self._lock = threading.Lock()
+        self._cache: OrderedDict = OrderedDict()   # Path → decoded PIL image
+        self._sizes: dict = {}                     # Path → estimated bytes held
+        self.held_bytes = 0
+        self._pending: set = set()
+        self._missed: set = set()   # Pending paths already counted as a miss
+        self._failed: set = set()   # Paths the worker could not decode
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = None
+
+        self.hits = 0
+        self.misses = 0
+        self._decode_ms: deque = deque(maxlen=100)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def prefetch(self, paths):
+        """Queue ``paths`` for background decoding (already cached ones are skipped)."""
+        with self._lock:
+            for path in paths:
+                if path in self._cache or path in self._pending or path in self._failed:
+                    continue
+                self._pending.add(path)
+                self._queue.put(path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker_loop, daemon=True)
+                self._thread.start()
+
+    def get(self, path: str, wait: bool = True):
+        """
+        Return the downscaled image for ``path``. On a miss it is decoded now,
+        or with ``wait=False`` queued for the worker and ``None`` returned.
+        """
+        with self._lock:
+            image = self._cache.get(path)
+            if image is not None:
+                self._cache.move_to_end(path)
+                self.hits += 1
+                return image
+            # Rechecking a path that is still decoding is the same miss.
+            if path not in self._missed:
+                self.misses += 1
+                self._missed.add(path)
+        if not wait:
+            self.prefetch([path])
+            return None
+        image = self._decode(path)
+        self._store(path, image)
+        return image
+
+    def has_failed(self, path: str) -> bool:
+        """True if the worker could not decode ``path`` (it won't be retried)."""
+        with self._lock:
+            return path in self._failed
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            decode_ms = list(self._decode_ms)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "mean_decode_ms": sum(decode_ms) / len(decode_ms) if decode_ms else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Decoding
+    # ------------------------------------------------------------------
+
+    def _decode(self, path: str):
+        start = time.perf_counter()
+        decoded = self._load(path)
+        with self._lock:
+            self._decode_ms.append((time.perf_counter() - start) * 1000)
+        return decoded
+
+    def _load(self, path: str):
+        image = Image.open(path)
+        image.thumbnail(self.max_size, Image.Resampling.LANCZOS)
+        image.load()
+        return image
+
+    def _entry_bytes(self, image) -> int:
+        return frame_bytes(image)
+
+    def _store(self, path, image):
+        size = self._entry_bytes(image)
+        with self._lock:
+            self.held_bytes += size - self._sizes.get(path, 0)
+            self._sizes[path] = size
+            self._cache[path] = image
+            self._cache.move_to_end(path)
+            self._missed.discard(path)
+            # The newest entry is always kept, even if it alone exceeds the budget.
+            while len(self._cache) > 1 and (
+                len(self._cache) > self.capacity
+                or (self.memory_budget is not None and self.held_bytes > self.memory_budget)
+            ):
+                evicted, _ = self._cache.popitem(last=False)
+                self.held_bytes -= self._sizes.pop(evicted)
+
+    def _worker_loop(self):
+        while True:
+            path = self._queue.get()
+            try:
+                self._store(path, self._decode(path))
+            except Exception as e:
+                print(f"Error prefetching {path}: {e}")
+                with self._lock:
+                    self._failed.add(path)
+                    self._missed.discard(path)
+            finally:
+                with self._lock:
+                    self._pending.discard(path)
+
+
+class GifPrefetcher(ImagePrefetcher):
+    """
+    Same cache, but entries are whole decoded GIF sequences (see
+    gif_frames.py). A resized animation is held as RGBA frames plus, once
+    played, one 4-byte-per-pixel PhotoImage per frame, so a single long GIF
+    can take tens of MB: the cache is bounded by that estimate in bytes.
+    """
+
+    CAPACITY = 4                          # Decoded animations kept in memory
+    MEMORY_BUDGET = 64 * 1024 * 1024      # Bytes of frames + PhotoImages kept
+
+    def __init__(self, max_size=(400, 300), capacity=CAPACITY, memory_budget=MEMORY_BUDGET):
+        super().__init__(max_size, capacity, memory_budget)
+
+    def _load(self, path: str):
+        return load_gif(path, self.max_size)
+
+    def _entry_bytes(self, sequence) -> int:
+        return sum(frame_bytes(frame) + frame.width * frame.height * 4
+                   for frame in sequence.frames)
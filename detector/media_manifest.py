@@ -0,0 +1,212 @@
+"""
+Media manifest — indexes the Punisher's media folders on a thread pool,
+probing each file's type, dimensions, frame count/fps and decode cost, and
+keeps the result in a JSON manifest invalidated per file by mtime/size. The
+Punisher picks from the manifest instead of listing folders on every
+punishment, and never tries to show files that failed to decode.
+
+Extra folders can be supplied with PUNISHER_MEDIA_DIRS (os.pathsep-separated).
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+from PIL import Image
+
+from .gif_frames import frame_duration
+
+IMAGE_EXT = (".png", ".jpg", ".jpeg")
+AUDIO_EXT = (".mp3", ".wav", ".ogg")
+VIDEO_EXT = (".mp4", ".avi", ".mkv")
+GIF_EXT = (".gif",)
+
+DEFAULT_MANIFEST_PATH = os.environ.get(
+    "PUNISHER_MANIFEST",
+    os.path.join(os.path.expanduser("~"), ".cache", "anti-doomscroll", "media_manifest.json"),
+)
+EXTRA_MEDIA_DIRS = [d for d in os.environ.get("PUNISHER_MEDIA_DIRS", "").split(os.pathsep) if d]
+
+PROBE_WORKERS = 4             # Files probed in parallel
+MANIFEST_VERSION = 2          # Bump when the entry format changes
+
+
+def media_kind(path: str):
+    """Return "image", "audio", "video" or "gif" for a supported extension, else ``None``."""
+    ext = path.lower()
+    if ext.endswith(IMAGE_EXT):
+        return "image"
+    if ext.endswith(AUDIO_EXT):
+        return "audio"
+    if ext.endswith(VIDEO_EXT):
+        return "video"
+    if ext.endswith(GIF_EXT):
+        return "gif"
+    return None
+
+
+def probe(path: str, kind: str, size: int, mtime: float) -> dict:
+    """Inspect one file; failures are recorded in the entry rather than raised."""
+    entry = {
+        "path": path, "kind": kind, "size": size, "mtime": mtime,
+        "ok": True, "error": None,
+        "width": None, "height": None, "frames": None, "fps": None, "decode_ms": None,
+    }
+    start = time.perf_counter()
+    try:
+        if kind == "image":
+            with Image.open(path) as image:
+                entry["width"], entry["height"] = image.size
+                image.load()
+        elif kind == "gif":
+            with Image.open(path) as gif:
+                entry["width"], entry["height"] = gif.size
+                entry["frames"] = getattr(gif, "n_frames", 1)
+                total_ms = 0
+                for index in range(entry["frames"]):
+                    gif.seek(index)
+                    gif.load()
+                    total_ms += frame_duration(gif.info.get("duration"))
+                entry["fps"] = round(entry["frames"] * 1000 / total_ms, 2)
+        elif kind == "video":
+            cap = cv2.VideoCapture(path)
+            try:
+                if not cap.isOpened():
+                    raise ValueError("cannot open")
+                entry["width"] = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                entry["height"] = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                entry["frames"] = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                entry["fps"] = cap.get(cv2.CAP_PROP_FPS) or None
+                ret, _ = cap.read()
+                if not ret:
+                    raise ValueError("no decodable frames")
+            finally:
+                cap.release()
+        elif size == 0:
+            # Audio is decoded (and validated) by the audio engine's sound bank.
+            raise ValueError("empty file")
+    except Exception as e:
+        entry["ok"] = False
+        entry["error"] = str(e)
+    if kind != "audio":
+        entry["decode_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return entry
+
+
+class MediaManifest:
+    def __init__(self, folders, manifest_path=DEFAULT_MANIFEST_PATH, workers=PROBE_WORKERS):
+        self.folders = [os.path.abspath(f) for f in folders]
+        self.manifest_path = manifest_path
+        self.workers = workers
+
+        self._lock = threading.Lock()
+        self._entries: dict = self._load()   # Absolute path → entry
+        self._scan_thread = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def refresh_async(self):
+        """Rescan the folders on a background thread (cached entries stay usable meanwhile)."""
+        if self._scan_thread is not None and self._scan_thread.is_alive():
+            return
+        self._scan_thread = threading.Thread(target=self.refresh, daemon=True)
+        self._scan_thread.start()
+
+    def refresh(self):
+        """Rescan the folders, probing only new or changed files, and save the manifest."""
+        start = time.perf_counter()
+        with self._lock:
+            cached = dict(self._entries)
+
+        current, to_probe = {}, []
+        for path in self._list_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entry = cached.get(path)
+            if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                current[path] = entry
+            else:
+                to_probe.append((path, media_kind(path), stat.st_size, stat.st_mtime))
+
+        if to_probe:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for entry in pool.map(lambda args: probe(*args), to_probe):
+                    current[entry["path"]] = entry
+
+        with self._lock:
+            self._entries = current
+        if to_probe or len(current) != len(cached):
+            self._save(current)
+
+        broken = sum(not e["ok"] for e in current.values())
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"Media manifest: {len(current)} files ({len(to_probe)} probed, "
+            f"{broken} broken) in {elapsed_ms:.0f} ms"
+        )
+
+    @property
+    def is_scanning(self) -> bool:
+        return self._scan_thread is not None and self._scan_thread.is_alive()
+
+    def entries(self, playable_only=True, wait=True) -> list:
+        """
+        Return the manifest entries. If nothing is indexed yet and a scan is
+        running (first launch), wait for it — unless ``wait=False`` (Tk
+        thread), in which case poll ``is_scanning`` instead.
+        """
+        with self._lock:
+            empty = not self._entries
+        if empty and wait and self._scan_thread is not None:
+            self._scan_thread.join()
+        with self._lock:
+            entries = list(self._entries.values())
+        return [e for e in entries if e["ok"]] if playable_only else entries
+
+    # ------------------------------------------------------------------
+    # Scanning / persistence
+    # ------------------------------------------------------------------
+
+    def _list_files(self):
+        for folder in self.folders:
+            if not os.path.isdir(folder):
+                print(f"Error: Media folder '{folder}' does not exist.")
+                continue
+            for name in sorted(os.listdir(folder)):
+                if media_kind(name):
+                    yield os.path.join(folder, name)
+
+    def _load(self) -> dict:
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading media manifest {self.manifest_path}: {e}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return {
+            path: entry for path, entry in data.get("entries", {}).items()
+            if os.path.dirname(path) in self.folders
+        }
+
+    def _save(self, entries: dict):
+        if not self.manifest_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            tmp_path = self.manifest_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"version": MANIFEST_VERSION, "entries": entries}, f, indent=1)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            print(f"Error writing media manifest {self.manifest_path}: {e}")
@@ -0,0 +1,73 @@
+"""
+Adaptive frame-rate power mode — drops the focus tracker to a low detection
+rate while the user has been steadily focused and snaps back to full rate
+on the first missed face. Also measures the achieved rate and the process
+CPU time spent per minute so the savings can be verified.
+"""
+
+import time
+from collections import deque
+
+
+class AdaptiveFrameRate:
+    FAST_INTERVAL_MS = 15     # Tick interval while anything is happening (~66 Hz)
+    IDLE_INTERVAL_MS = 250    # Tick interval once focus has settled (4 fps)
+    SETTLE_S = 5.0            # Seconds of uninterrupted focus before idling
+    CPU_WINDOW_S = 60.0       # Window for the CPU-time-per-minute figure
+
+    def __init__(self, fast_interval_ms=FAST_INTERVAL_MS,
+                 idle_interval_ms=IDLE_INTERVAL_MS, settle_s=SETTLE_S):
+        self.fast_interval_ms = fast_interval_ms
+        self.idle_interval_ms = idle_interval_ms
+        self.settle_s = settle_s
+
+        self.interval_ms = fast_interval_ms
+        self.focused_since = None
+
+        self._ticks = deque(maxlen=30)                 # Monotonic tick timestamps
+        self._cpu_samples = deque()                    # (wall, cpu) pairs
+
+    @property
+    def is_idle(self) -> bool:
+        return self.interval_ms == self.idle_interval_ms
+
+    def update(self, focused: bool, now: float = None) -> int:
+        """
+        Record a processed frame and return the interval (ms) until the next
+        tick. ``focused`` means a face was seen and no distraction is pending.
+        """
+        now = time.monotonic() if now is None else now
+        self._ticks.append(now)
+        self._sample_cpu(now)
+
+        if not focused:
+            self.focused_since = None
+            self.interval_ms = self.fast_interval_ms
+        else:
+            if self.focused_since is None:
+                self.focused_since = now
+            if now - self.focused_since >= self.settle_s:
+                self.interval_ms = self.idle_interval_ms
+        return self.interval_ms
+
+    # ------------------------------------------------------------------
+    # Measurements
+    # ------------------------------------------------------------------
+
+    def current_fps(self) -> float:
+        if len(self._ticks) < 2:
+            return 0.0
+        span = self._ticks[-1] - self._ticks[0]
+        return (len(self._ticks) - 1) / span if span > 0 else 0.0
+
+    def cpu_seconds_per_minute(self) -> float:
+        if len(self._cpu_samples) < 2:
+            return 0.0
+        (wall0, cpu0), (wall1, cpu1) = self._cpu_samples[0], self._cpu_samples[-1]
+        span = wall1 - wall0
+        return (cpu1 - cpu0) / span * 60.0 if span > 0 else 0.0
+
+    def _sample_cpu(self, now):
+        self._cpu_samples.append((now, time.process_time()))
+        while now - self._cpu_samples[0][0] > self.CPU_WINDOW_S:
+            self._cpu_samples.popleft()
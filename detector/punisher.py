@@ -3,35 +3,92 @@ Punisher — floods the screen with random images, GIFs, videos, and audio
 from the assets/media folder while the user is distracted.
 """
 
-import os
+import math
 import random
-import threading
 import time
-from tkinter import Label, Toplevel
+from tkinter import Label, TclError, Tk, Toplevel
 
-import cv2
-import pygame
 from PIL import Image, ImageTk
 
+from .audio_engine import get_audio_engine
+from .media_cache import GifPrefetcher, ImagePrefetcher
+from .media_manifest import (
+    AUDIO_EXT, EXTRA_MEDIA_DIRS, GIF_EXT, IMAGE_EXT, VIDEO_EXT, MediaManifest,
+)
+from .video_stream import VideoDecoder
+
+
+class PopupWindow:
+    """A borderless, topmost popup that is moved and re-shown instead of recreated."""
+
+    def __init__(self, root):
+        self.window = Toplevel(root)
+        self.window.title("Focus!")
+        self.window.overrideredirect(True)
+        self.window.attributes("-topmost", True)
+        self.window.withdraw()
+        self.label = Label(self.window)
+        self.label.pack()
+
+        self.generation = 0     # Bumped on every hide so stale callbacks can bail out
+        self.on_hide = None     # One-shot cleanup (e.g. stop a video decoder)
+
+    def show(self, x: int, y: int, photo=None):
+        self.window.geometry(f"+{x}+{y}")
+        if photo is not None:
+            self.set_image(photo)
+        self.window.deiconify()
+        self.window.lift()
+
+    def set_image(self, photo):
+        self.label.photo = photo  # Keep reference
+        self.label.config(image=photo)
+
+    def hide(self):
+        self.generation += 1
+        if self.on_hide is not None:
+            self.on_hide()
+            self.on_hide = None
+        self.window.withdraw()
+        self.label.config(image="")
+        self.label.photo = None
+
 
 class Punisher:
-    IMAGE_EXT = (".png", ".jpg", ".jpeg")
-    AUDIO_EXT = (".mp3", ".wav", ".ogg")
-    VIDEO_EXT = (".mp4", ".avi", ".mkv", ".gif")
+    IMAGE_EXT = IMAGE_EXT
+    AUDIO_EXT = AUDIO_EXT
+    VIDEO_EXT = VIDEO_EXT
+    GIF_EXT = GIF_EXT
 
-    MAX_WINDOWS = 10            # Cap on concurrent popup windows
+    MAX_WINDOWS = 10            # Cap on concurrent popup windows (size of the reuse pool)
     POPUP_LIFETIME_MS = 5000    # How long each popup stays on screen
     SPAWN_INTERVAL_S = 0.7      # Seconds between new media spawns
+    PREFETCH_AHEAD = 3          # Upcoming images/GIFs decoded ahead of their spawn
+    PREFETCH_RETRY_MS = 20      # Recheck delay for an image slot still being decoded
+    SCAN_POLL_MS = 100          # Recheck delay while the first manifest scan is running
 
-    def __init__(self, media_folder: str, root_window):
+    def __init__(self, media_folder: str, root_window, audio=None,
+                 rng=None, clock=time.monotonic):
         self.media_folder = media_folder
         self.root = root_window
+        self.rng = rng or random.Random()   # Inject a seeded Random / fake clock
+        self.clock = clock                  # for reproducible spawn sequences
         self.is_punishing = False
-        self.punish_thread = None
-        self.windows: list = []
-        self.pending_images: list = []
-
-        pygame.mixer.init()
+        self.windows: list = []     # Popups currently on screen
+        self.pool = [PopupWindow(root_window) for _ in range(self.MAX_WINDOWS)]
+
+        self._playlist: list = []
+        self._playlist_index = 0
+        self._next_spawn = None     # Monotonic deadline of the next spawn
+        self._spawn_job = None      # Pending root.after() id
+        self.prefetcher = ImagePrefetcher(max_size=(400, 400))
+        self.gif_cache = GifPrefetcher(max_size=(400, 300))
+        self.audio = audio or get_audio_engine()
+
+        # Index the media folders in the background so punishment can start
+        # from the cached manifest instantly.
+        self.manifest = MediaManifest([media_folder, *EXTRA_MEDIA_DIRS])
+        self.manifest.refresh_async()
 
     # ------------------------------------------------------------------
     # Public API
@@ -40,154 +97,296 @@ class Punisher:
     def start_punishment(self):
         if self.is_punishing:
             return
+        # Latched until stop_punishment(), so the per-frame calls from the
+        # tracker don't rescan (or re-report missing media) every frame.
         self.is_punishing = True
-        self.punish_thread = threading.Thread(
-            target=self._spam_loop, daemon=True
-        )
-        self.punish_thread.start()
-        self._process_pending_images()
+        self._start_playlist()
+
+    def _start_playlist(self):
+        self._spawn_job = None
+        if not self.is_punishing:
+            return
+        # Never join the manifest scan on the Tk thread: on a first launch
+        # with no cache, check back until the scan has indexed something.
+        entries = self.manifest.entries(wait=False)
+        if not entries:
+            if self.manifest.is_scanning:
+                self._spawn_job = self.root.after(self.SCAN_POLL_MS, self._start_playlist)
+            else:
+                print("No playable media files found in the media folders.")
+            return
+
+        self._playlist = [entry["path"] for entry in entries]
+        self.rng.shuffle(self._playlist)
+        self._playlist_index = 0
+        # Start decoding the first images/GIFs before the first slot is due.
+        self._prefetch_upcoming()
+        self._next_spawn = self.clock()
+        self._spawn_due()
 
     def stop_punishment(self):
+        was_punishing = self.is_punishing
         self.is_punishing = False
+        if self._spawn_job is not None:
+            self.root.after_cancel(self._spawn_job)
+            self._spawn_job = None
         self._close_all_windows()
-        pygame.mixer.stop()
+        self.audio.stop_voices()
+        if was_punishing:
+            self._report_cache_stats()
+
+    def _report_cache_stats(self):
+        for name, cache in (("image", self.prefetcher), ("GIF", self.gif_cache)):
+            stats = cache.stats()
+            print(
+                f"Punisher {name} cache: {stats['hits']} hits / {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), mean decode {stats['mean_decode_ms']:.1f} ms"
+            )
 
     # ------------------------------------------------------------------
-    # Window / image management
+    # Popup pool
     # ------------------------------------------------------------------
 
-    def _close_all_windows(self):
-        for window in self.windows[:]:
-            try:
-                window.destroy()
-            except Exception:
-                pass
-        self.windows.clear()
-        self.pending_images.clear()
-
-    def _close_window(self, window):
+    def _acquire_popup(self):
+        """Take a hidden popup from the pool, or ``None`` if all are on screen."""
+        return self.pool.pop() if self.pool else None
+
+    def _release_popup(self, popup):
+        if popup in self.windows:
+            self.windows.remove(popup)
         try:
-            if window in self.windows:
-                self.windows.remove(window)
-            window.destroy()
+            popup.hide()
         except Exception:
             pass
+        if popup not in self.pool:
+            self.pool.append(popup)
+
+    def _show_popup(self, popup, photo=None):
+        x = self.rng.randint(0, 1200)
+        y = self.rng.randint(0, 700)
+        popup.show(x, y, photo)
+        self.windows.append(popup)
+        generation = popup.generation
+        popup.window.after(
+            self.POPUP_LIFETIME_MS, lambda: self._expire_popup(popup, generation)
+        )
 
-    def _process_pending_images(self):
-        """Dequeue pending image paths and open them on the main thread."""
-        if not self.is_punishing:
-            return
-        while self.pending_images and len(self.windows) < self.MAX_WINDOWS:
-            image_path = self.pending_images.pop(0)
-            self._open_image_window(image_path)
-        if self.is_punishing:
-            self.root.after(100, self._process_pending_images)
-
-    def _open_image_window(self, image_path: str):
-        try:
-            window = Toplevel(self.root)
-            window.title("Focus!")
-            window.overrideredirect(True)
-            window.attributes("-topmost", True)
-
-            x = random.randint(0, 1200)
-            y = random.randint(0, 700)
-            window.geometry(f"+{x}+{y}")
+    def _expire_popup(self, popup, generation):
+        # Ignore timers from an earlier use of a since-recycled popup.
+        if popup.generation == generation:
+            self._release_popup(popup)
 
-            img = Image.open(image_path)
-            img.thumbnail((400, 400), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
+    def _close_all_windows(self):
+        for popup in self.windows[:]:
+            self._release_popup(popup)
 
-            label = Label(window, image=photo)
-            label.image = photo  # Keep reference
-            label.pack()
+    # ------------------------------------------------------------------
+    # Images / videos
+    # ------------------------------------------------------------------
 
-            self.windows.append(window)
-            window.after(self.POPUP_LIFETIME_MS, lambda: self._close_window(window))
+    def _open_image_window(self, image_path: str) -> bool:
+        """Show ``image_path``; ``False`` if it is still being decoded (retry the slot)."""
+        # Never decode on the Tk thread: a miss queues it for the worker.
+        image = self.prefetcher.get(image_path, wait=False)
+        if image is None:
+            return self.prefetcher.has_failed(image_path)   # Skip undecodable files
+        popup = self._acquire_popup()
+        if popup is None:
+            return True
+        try:
+            self._show_popup(popup, ImageTk.PhotoImage(image))
         except Exception as e:
+            self._release_popup(popup)
             print(f"Error displaying {image_path}: {e}")
+        return True
 
     def _open_video_window(self, video_path: str):
+        popup = self._acquire_popup()
+        if popup is None:
+            return
         try:
-            window = Toplevel(self.root)
-            window.title("Focus!")
-            window.overrideredirect(True)
-            window.attributes("-topmost", True)
-
-            x = random.randint(0, 1200)
-            y = random.randint(0, 700)
-            window.geometry(f"+{x}+{y}")
-
-            label = Label(window)
-            label.pack()
-            self.windows.append(window)
-
-            cap = cv2.VideoCapture(video_path)
+            decoder = VideoDecoder(video_path, size=(400, 300))
+            decoder.start()
+            popup.on_hide = decoder.stop
+            self._show_popup(popup)
+            generation = popup.generation
+            poll_ms = max(10, int(decoder.frame_interval * 1000))
 
             def update_frame():
-                if not window.winfo_exists() or not self.is_punishing:
-                    cap.release()
+                if popup.generation != generation or not self.is_punishing:
+                    decoder.stop()
                     return
-                ret, frame = cap.read()
-                if not ret:
-                    cap.release()
-                    self._close_window(window)
+                if decoder.is_done:
+                    self._release_popup(popup)
                     return
-                frame = cv2.resize(frame, (400, 300))
-                img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-                photo = ImageTk.PhotoImage(image=img)
-                label.photo = photo
-                label.config(image=photo)
-                window.after(33, update_frame)  # ~30 FPS
+                # Decoding happens off-thread; here we only swap in the newest
+                # due frame (older ones are dropped if we fell behind).
+                img = decoder.next_frame()
+                if img is not None:
+                    popup.set_image(ImageTk.PhotoImage(image=img))
+                popup.window.after(poll_ms, update_frame)
 
             update_frame()
-            # Safety timeout to avoid runaway memory usage
-            window.after(self.POPUP_LIFETIME_MS, lambda: self._close_window(window))
         except Exception as e:
+            self._release_popup(popup)
             print(f"Error displaying video {video_path}: {e}")
 
+    def _open_gif_window(self, gif_path: str):
+        popup = self._acquire_popup()
+        if popup is None:
+            return
+        try:
+            # Decoding a long GIF can take most of a second, so a GIF that
+            # isn't ready yet skips this slot rather than block the Tk thread.
+            sequence = self.gif_cache.get(gif_path, wait=False)
+            if sequence is None:
+                self._release_popup(popup)
+                return
+            self._show_popup(popup, sequence.photo(0))
+            generation = popup.generation
+
+            def show_frame(index):
+                if popup.generation != generation or not self.is_punishing:
+                    return
+                popup.set_image(sequence.photo(index))
+                popup.window.after(
+                    sequence.durations[index],
+                    lambda: show_frame((index + 1) % len(sequence.frames)),
+                )
+
+            if len(sequence.frames) > 1:
+                popup.window.after(sequence.durations[0], lambda: show_frame(1))
+        except Exception as e:
+            self._release_popup(popup)
+            print(f"Error displaying GIF {gif_path}: {e}")
+
     # ------------------------------------------------------------------
     # Audio
     # ------------------------------------------------------------------
 
     def _play_audio(self, audio_path: str):
-        try:
-            pygame.mixer.Sound(audio_path).play()
-        except Exception as e:
-            print(f"Error playing audio {audio_path}: {e}")
+        self.audio.play(audio_path)
 
     # ------------------------------------------------------------------
-    # Spam loop (background thread)
+    # Spawn scheduler (main thread)
     # ------------------------------------------------------------------
 
-    def _spam_loop(self):
-        valid_ext = self.IMAGE_EXT + self.AUDIO_EXT + self.VIDEO_EXT
-
-        if not os.path.exists(self.media_folder):
-            print(f"Error: Media folder '{self.media_folder}' does not exist.")
-            return
-
-        files = [
-            f for f in os.listdir(self.media_folder)
-            if f.lower().endswith(valid_ext)
-        ]
-        if not files:
-            print("No valid media files found in assets/media.")
+    def _spawn_due(self):
+        """Spawn the media whose deadline has passed, then sleep until the next one."""
+        self._spawn_job = None
+        if not self.is_punishing:
             return
+        now = self.clock()
+        if now >= self._next_spawn:
+            if not self._spawn_next():
+                # The slot's image is still decoding: keep the deadline and
+                # check back shortly instead of blocking or skipping it.
+                self._spawn_job = self.root.after(self.PREFETCH_RETRY_MS, self._spawn_due)
+                return
+            # Deadlines stay on the start + k * interval grid so they don't
+            # drift; slots missed while the UI was busy are skipped, not burst.
+            missed = math.floor((now - self._next_spawn) / self.SPAWN_INTERVAL_S)
+            self._next_spawn += (missed + 1) * self.SPAWN_INTERVAL_S
+        delay_ms = max(0, math.ceil((self._next_spawn - now) * 1000))
+        self._spawn_job = self.root.after(delay_ms, self._spawn_due)
+
+    def _spawn_next(self) -> bool:
+        """Spawn the current playlist entry; ``False`` if its image isn't decoded yet."""
+        paths = self._playlist
+        media_path = paths[self._playlist_index]
+        ext = media_path.lower()
+        self._prefetch_upcoming()
+
+        # With every popup already on screen, image/video/GIF slots are skipped.
+        if ext.endswith(self.IMAGE_EXT):
+            if not self._open_image_window(media_path):
+                return False
+        elif ext.endswith(self.AUDIO_EXT):
+            self._play_audio(media_path)
+        elif ext.endswith(self.VIDEO_EXT):
+            self._open_video_window(media_path)
+        elif ext.endswith(self.GIF_EXT):
+            self._open_gif_window(media_path)
+
+        self._playlist_index = (self._playlist_index + 1) % len(paths)
+        return True
+
+    def _prefetch_upcoming(self):
+        paths = self._playlist
+        for cache, exts in ((self.prefetcher, self.IMAGE_EXT), (self.gif_cache, self.GIF_EXT)):
+            upcoming = self._upcoming(paths, self._playlist_index, exts)
+            if upcoming:
+                cache.prefetch(upcoming)
+
+    def _upcoming(self, paths, start, exts):
+        """Return the next ``PREFETCH_AHEAD`` paths ending in ``exts`` from ``start``."""
+        upcoming = []
+        for offset in range(len(paths)):
+            path = paths[(start + offset) % len(paths)]
+            if path.lower().endswith(exts) and path not in upcoming:
+                upcoming.append(path)
+                if len(upcoming) == self.PREFETCH_AHEAD:
+                    break
+        return upcoming
+
+
+def benchmark_popups(root, count: int = 300):
+    """
+    Print popups/sec for creating and destroying a Toplevel per popup versus
+    reusing the pre-created pool (pool creation is excluded, as in the app,
+    where it happens at startup). Needs a display.
+    """
+    photo = ImageTk.PhotoImage(Image.new("RGB", (400, 300), "#8ACE00"))
+
+    def random_position():
+        return random.randint(0, 1200), random.randint(0, 700)
+
+    def create_destroy():
+        live = []
+        for _ in range(count):
+            window = Toplevel(root)
+            window.overrideredirect(True)
+            window.attributes("-topmost", True)
+            x, y = random_position()
+            window.geometry(f"+{x}+{y}")
+            Label(window, image=photo).pack()
+            live.append(window)
+            if len(live) > Punisher.MAX_WINDOWS:
+                live.pop(0).destroy()
+            root.update()
+        for window in live:
+            window.destroy()
 
-        random.shuffle(files)
-        file_index = 0
-
-        while self.is_punishing:
-            media_path = os.path.join(self.media_folder, files[file_index])
-            ext = media_path.lower()
-
-            if ext.endswith(self.IMAGE_EXT):
-                self.pending_images.append(media_path)
-            elif ext.endswith(self.AUDIO_EXT):
-                self._play_audio(media_path)
-            elif ext.endswith(self.VIDEO_EXT):
-                self.root.after(0, lambda p=media_path: self._open_video_window(p))
-
-            file_index = (file_index + 1) % len(files)
-            time.sleep(self.SPAWN_INTERVAL_S)
+    pool = [PopupWindow(root) for _ in range(Punisher.MAX_WINDOWS)]
+    root.update()
+
+    def pooled():
+        live = []
+        for _ in range(count):
+            if not pool:
+                oldest = live.pop(0)
+                oldest.hide()
+                pool.append(oldest)
+            popup = pool.pop()
+            popup.show(*random_position(), photo)
+            live.append(popup)
+            root.update()
+        for popup in live:
+            popup.hide()
+
+    for name, run in (("create/destroy", create_destroy), ("pooled", pooled)):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<15} {count / elapsed:8.1f} popups/s  ({elapsed * 1000 / count:.2f} ms each)")
+
+
+if __name__ == "__main__":
+    try:
+        root = Tk()
+    except TclError as e:
+        raise SystemExit(f"Error: the popup benchmark needs a display ({e}); "
+                         f"on a headless machine run it under xvfb-run")
+    root.withdraw()
+    benchmark_popups(root)
+    root.destroy()
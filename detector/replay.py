@@ -0,0 +1,143 @@
+"""
+Replay harness — feeds recorded footage (a video file or a directory of
+frames) through the tracker's flip/convert/detect/decide path as fast as
+possible, and reports throughput, per-frame latency percentiles and the
+resulting focus-state timeline (plus a per-stage breakdown). No webcam or
+Tk needed.
+
+Time inside the state machine follows the footage (frame timestamps), not
+the wall clock, so the timeline is reproducible however fast the machine is.
+
+Usage:
+    python -m detector.replay footage.mp4 [--mode roi,track] [--backend haar,yunet]
+    python -m detector.replay frames_dir/ --fps 15 --json report.json
+"""
+
+import argparse
+import json
+import os
+import time
+
+import cv2
+
+from .face_backends import DEFAULT_BACKEND, create_face_detector
+from .face_search import create_face_search, process_frame
+from .focus_state import MAX_TICK_S, FocusStateMachine
+from .stage_timer import StageTimer, percentile
+
+FRAME_EXT = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def iter_frames(source: str, fps: float = None):
+    """Yield ``(timestamp_s, frame_bgr)`` from a video file or a frame directory."""
+    if os.path.isdir(source):
+        names = sorted(f for f in os.listdir(source) if f.lower().endswith(FRAME_EXT))
+        step = 1.0 / (fps or 30.0)
+        for i, name in enumerate(names):
+            frame = cv2.imread(os.path.join(source, name))
+            if frame is not None:
+                yield i * step, frame
+        return
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Cannot open video {source}")
+    step = 1.0 / (fps or cap.get(cv2.CAP_PROP_FPS) or 30.0)
+    index = 0
+    try:
+        while True:
+            success, frame = cap.read()
+            if not success:
+                return
+            yield index * step, frame
+            index += 1
+    finally:
+        cap.release()
+
+
+def replay(source: str, detection_mode="roi", backend=DEFAULT_BACKEND, fps=None) -> dict:
+    """Run one configuration over ``source`` and return its report."""
+    detector = create_face_detector(backend, scale_factor=1.1, min_neighbors=6)
+    face_search = create_face_search(detection_mode, detector, min_size=(100, 100))
+    focus = FocusStateMachine()
+    timer = StageTimer(log_path=None, window=10**6)
+
+    latencies_ms = []
+    timeline = [{"t": 0.0, "state": focus.state}]
+    faces_seen = 0
+    last_t = None
+
+    start = time.perf_counter()
+    for t, frame in iter_frames(source, fps):
+        tick = time.perf_counter()
+        _, faces = process_frame(frame, face_search, timer)
+        dt = 0.0 if last_t is None else min(t - last_t, MAX_TICK_S)
+        last_t = t
+        focus.update(bool(faces), dt)
+        latencies_ms.append((time.perf_counter() - tick) * 1000)
+
+        faces_seen += bool(faces)
+        if focus.state != timeline[-1]["state"]:
+            timeline.append({"t": round(t, 3), "state": focus.state})
+    wall_s = time.perf_counter() - start
+
+    frames = len(latencies_ms)
+    return {
+        "source": source,
+        "mode": detection_mode,
+        "backend": backend,
+        "frames": frames,
+        "face_frames": faces_seen,
+        "wall_s": round(wall_s, 3),
+        "fps": round(frames / wall_s, 1) if wall_s > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies_ms, 50), 2),
+            "p95": round(percentile(latencies_ms, 95), 2),
+            "p99": round(percentile(latencies_ms, 99), 2),
+        },
+        "stages_ms": timer.snapshot(),
+        "total_distractions": focus.total_distractions,
+        "timeline": timeline,
+    }
+
+
+def _print_report(report: dict):
+    lat = report["latency_ms"]
+    print(
+        f"{report['backend']:>10} / {report['mode']:<5}  "
+        f"{report['frames']:>6} frames  {report['fps']:>7.1f} fps  "
+        f"p50 {lat['p50']:>6.2f} ms  p95 {lat['p95']:>6.2f} ms  p99 {lat['p99']:>6.2f} ms  "
+        f"faces {report['face_frames']}/{report['frames']}  "
+        f"distractions {report['total_distractions']}"
+    )
+    for name, s in report["stages_ms"].items():
+        print(f"{'':>14}{name:<8} p50 {s['p50']:>6.2f}  p95 {s['p95']:>6.2f}  p99 {s['p99']:>6.2f} ms")
+    for entry in report["timeline"]:
+        print(f"{'':>14}{entry['t']:>9.2f}s  {entry['state']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay footage through the focus detector")
+    parser.add_argument("source", help="Video file or directory of frames")
+    parser.add_argument("--mode", default="roi", help="Comma-separated: full,roi,track")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND,
+                        help="Comma-separated: haar,yunet,mediapipe")
+    parser.add_argument("--fps", type=float, help="Frame rate for frame directories "
+                        "(or to override the video's own)")
+    parser.add_argument("--json", help="Write all reports to this JSON file")
+    args = parser.parse_args(argv)
+
+    reports = []
+    for backend in args.backend.split(","):
+        for mode in args.mode.split(","):
+            report = replay(args.source, mode, backend, args.fps)
+            _print_report(report)
+            reports.append(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Stage timer — per-stage wall-clock timing for the frame loop with rolling
+p50/p95/p99 statistics, an overlay text helper and a periodic JSON-lines
+dump, so "the app feels laggy" reports can be traced to a specific stage.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+DEFAULT_LOG_PATH = os.environ.get(
+    "FRAME_TIMING_LOG",
+    os.path.join(os.path.expanduser("~"), ".cache", "anti-doomscroll", "frame_timing.jsonl"),
+)
+
+
+def percentile(values, q: float) -> float:
+    """Nearest-rank percentile of ``values`` (``q`` in 0–100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class StageTimer:
+    WINDOW = 300              # Samples kept per stage for the rolling stats
+    DUMP_INTERVAL_S = 60.0    # Seconds between JSON dumps to the log file
+
+    def __init__(self, log_path=DEFAULT_LOG_PATH, window=WINDOW,
+                 dump_interval_s=DUMP_INTERVAL_S):
+        self.log_path = log_path
+        self.window = window
+        self.dump_interval_s = dump_interval_s
+
+        self._lock = threading.Lock()   # The capture thread records too
+        self._samples: dict = {}
+        self._last_dump = time.monotonic()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name: str, ms: float):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(ms)
+
+    def snapshot(self) -> dict:
+        """Return ``{stage: {"p50", "p95", "p99", "count"}}`` in milliseconds."""
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+        return {
+            name: {
+                "p50": round(percentile(values, 50), 2),
+                "p95": round(percentile(values, 95), 2),
+                "p99": round(percentile(values, 99), 2),
+                "count": len(values),
+            }
+            for name, values in samples.items()
+        }
+
+    def overlay_lines(self) -> list:
+        return [
+            f"{name:<10} p50 {s['p50']:5.1f}  p95 {s['p95']:5.1f}  p99 {s['p99']:5.1f} ms"
+            for name, s in self.snapshot().items()
+        ]
+
+    def maybe_dump(self, now: float = None):
+        """Append a JSON snapshot to the log file once per dump interval."""
+        now = time.monotonic() if now is None else now
+        if not self.log_path or now - self._last_dump < self.dump_interval_s:
+            return
+        self._last_dump = now
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps({"timestamp": time.time(), "stages": self.snapshot()}) + "\n")
+        except OSError as e:
+            print(f"Error writing frame timing log {self.log_path}: {e}")
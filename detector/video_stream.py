@@ -0,0 +1,130 @@
+"""
+Video stream — decodes a video file on a background thread into a small
+bounded queue of display-ready frames (resized, RGB, PIL), paced to the
+source frame rate. The Tk side only swaps images; when it falls behind,
+late frames are dropped instead of slowing playback down. With ``loop=True``
+the video restarts at the end without breaking the frame clock.
+"""
+
+import queue
+import threading
+import time
+
+import cv2
+from PIL import Image
+
+
+class VideoDecoder:
+    QUEUE_SIZE = 4            # Ready frames buffered ahead of the UI
+
+    def __init__(self, path: str, size=(400, 300), queue_size=QUEUE_SIZE, loop=False):
+        self.path = path
+        self.size = size
+        self.loop = loop
+        self.frames: queue.Queue = queue.Queue(maxsize=queue_size)
+
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_interval = 1.0 / fps if fps and fps > 0 else 1 / 30
+
+        self.is_running = False
+        self.finished = False       # Source exhausted (or failed to open)
+        self.thread = None
+        self._start_time = None
+
+        self.frames_decoded = 0
+        self.frames_dropped = 0
+        self._frames_since_rewind = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if not self.cap.isOpened():
+            self.finished = True
+            return
+        self.is_running = True
+        self._start_time = time.monotonic()
+        self.thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.is_running = False
+
+    @property
+    def is_done(self) -> bool:
+        return self.finished and self.frames.empty()
+
+    # ------------------------------------------------------------------
+    # Consumer API (Tk thread)
+    # ------------------------------------------------------------------
+
+    def next_frame(self):
+        """
+        Return the newest frame that is due, dropping older due frames, or
+        ``None`` if nothing new is due yet.
+        """
+        if self._start_time is None:
+            return None
+        now = time.monotonic() - self._start_time
+        frame = None
+        # Single consumer: peeking the head is safe, the decoder only appends.
+        while self.frames.queue and self.frames.queue[0][0] <= now:
+            if frame is not None:
+                self.frames_dropped += 1
+            _, frame = self.frames.get_nowait()
+        return frame
+
+    # ------------------------------------------------------------------
+    # Decode loop (background thread)
+    # ------------------------------------------------------------------
+
+    def _decode_loop(self):
+        index = 0
+        try:
+            while self.is_running:
+                pts = index * self.frame_interval
+                index += 1
+                behind = time.monotonic() - self._start_time - pts > self.frame_interval
+
+                # Behind the clock with frames still waiting: this one would
+                # be dropped anyway, so skip it without decoding.
+                if behind and not self.frames.empty():
+                    if self.cap.grab():
+                        self._frames_since_rewind += 1
+                        self.frames_dropped += 1
+                    elif self._rewind():
+                        index -= 1      # Retry this timestamp from the start
+                    else:
+                        break
+                    continue
+
+                ret, frame = self.cap.read()
+                if not ret:
+                    if self._rewind():
+                        index -= 1
+                        continue
+                    break
+                self._frames_since_rewind += 1
+                frame = cv2.resize(frame, self.size)
+                image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                self.frames_decoded += 1
+
+                while self.is_running:
+                    try:
+                        self.frames.put((pts, image), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        finally:
+            self.finished = True
+            self.cap.release()
+
+    def _rewind(self) -> bool:
+        """Seek back to the first frame when looping (and the last pass played anything)."""
+        if not self.loop or self._frames_since_rewind == 0:
+            return False
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self._frames_since_rewind = 0
+        return True
@@ -0,0 +1,205 @@
+"""
+Vision worker — runs capture, flip/colour conversion and face detection in
+a separate process so they no longer compete for the GIL with Tk, pygame
+and the Punisher.
+
+Frames travel through a ``multiprocessing.shared_memory`` ring buffer;
+only compact detection results (slot, sequence number, timestamp, face
+boxes) go back over a pipe. Each slot has a sequence-number header that the
+worker clears while writing, so the UI can detect and skip a torn read.
+"""
+
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from .camera_probe import open_capture
+from .face_backends import DEFAULT_BACKEND, create_face_detector
+from .face_search import create_face_search
+
+FRAME_SHAPE = (480, 640, 3)   # RGB frames exchanged through shared memory
+RING_SLOTS = 4                # Frames the worker can run ahead of the UI
+
+
+class VisionWorker:
+    """UI-side handle for the vision worker process."""
+
+    def __init__(self, camera, detection_mode="roi", backend=DEFAULT_BACKEND,
+                 detector_params=None, search_params=None,
+                 frame_shape=FRAME_SHAPE, slots=RING_SLOTS):
+        self.frame_shape = frame_shape
+        self.slots = slots
+        frame_bytes = int(np.prod(frame_shape))
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=slots * (frame_bytes + 8)
+        )
+        self.headers, self.frames = _ring_views(self.shm, frame_shape, slots)
+        self.headers[:] = -1
+
+        ctx = mp.get_context("spawn")  # Never fork a process that owns Tk
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(
+                self.shm.name, child_conn, camera, frame_shape, slots,
+                detection_mode, backend,
+                detector_params or {}, search_params or {},
+            ),
+            daemon=True,
+        )
+
+        self.is_running = False
+        self.frames_captured = 0
+        self.frames_dropped = 0   # Results superseded before the UI consumed them
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.process.start()
+
+    def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        try:
+            self.conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        del self.headers, self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+    def set_interval(self, seconds: float):
+        """Ask the worker to decode and detect at most once per ``seconds``."""
+        if self.is_running:
+            self.conn.send(("interval", seconds))
+
+    # ------------------------------------------------------------------
+    # Consumer API
+    # ------------------------------------------------------------------
+
+    def latest(self):
+        """
+        Drain pending results and return ``(frame_rgb, faces, timestamp,
+        timings)`` for the newest one, or ``None`` if nothing new (or only a
+        torn frame) arrived. ``timings`` maps worker stages to milliseconds.
+        """
+        newest = None
+        while self.is_running and self.conn.poll():
+            try:
+                message = self.conn.recv()
+            except EOFError:
+                return None
+            self.frames_captured += 1
+            if newest is not None:
+                self.frames_dropped += 1
+            newest = message
+        if newest is None:
+            return None
+
+        slot, seq = newest["slot"], newest["seq"]
+        if self.headers[slot] != seq:
+            self.frames_dropped += 1
+            return None
+        frame = self.frames[slot].copy()
+        if self.headers[slot] != seq:  # Overwritten while copying
+            self.frames_dropped += 1
+            return None
+        return frame, newest["faces"], newest["timestamp"], newest["timings"]
+
+    def stats(self) -> dict:
+        return {"captured": self.frames_captured, "dropped": self.frames_dropped}
+
+
+def _ring_views(shm, frame_shape, slots):
+    headers = np.ndarray((slots,), dtype=np.int64, buffer=shm.buf)
+    frames = np.ndarray(
+        (slots, *frame_shape), dtype=np.uint8, buffer=shm.buf, offset=slots * 8
+    )
+    return headers, frames
+
+
+# ----------------------------------------------------------------------
+# Worker process
+# ----------------------------------------------------------------------
+
+def _worker_main(shm_name, conn, camera, frame_shape, slots,
+                 detection_mode, backend, detector_params, search_params):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    headers, frames = _ring_views(shm, frame_shape, slots)
+
+    cap = open_capture(camera)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, frame_shape[1])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, frame_shape[0])
+
+    detector = create_face_detector(backend, **detector_params)
+    face_search = create_face_search(detection_mode, detector, **search_params)
+
+    timings = {}
+    seq = 0
+    interval = 0.0
+    last_decode = 0.0
+    try:
+        while True:
+            if conn.poll():
+                command = conn.recv()
+                if command[0] == "stop":
+                    break
+                if command[0] == "interval":
+                    interval = command[1]
+
+            # grab() every frame to keep the driver queue fresh, but only
+            # decode and detect once per interval.
+            start = time.perf_counter()
+            if not cap.grab():
+                time.sleep(0.05)
+                continue
+            if time.monotonic() - last_decode < interval:
+                continue
+            success, frame = cap.retrieve()
+            if not success:
+                continue
+            last_decode = time.monotonic()
+            timestamp = time.time()
+            timings["read"] = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            frame = cv2.flip(frame, 1)
+            if frame.shape != frame_shape:
+                frame = cv2.resize(frame, (frame_shape[1], frame_shape[0]))
+            timings["flip"] = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            faces = face_search.detect(frame)
+            timings["detect"] = (time.perf_counter() - start) * 1000
+
+            seq += 1
+            slot = seq % slots
+            start = time.perf_counter()
+            headers[slot] = -1
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frames[slot])
+            headers[slot] = seq
+            timings["cvt_rgb"] = (time.perf_counter() - start) * 1000
+            conn.send({
+                "slot": slot, "seq": seq,
+                "timestamp": timestamp, "faces": faces,
+                "timings": timings,
+            })
+    except (BrokenPipeError, EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        cap.release()
+        del headers, frames
+        shm.close()
@@ -0,0 +1,35 @@
+"""Track mode must keep the full scan's face/no-face timeline on real footage."""
+
+import glob
+import os
+
+import pytest
+
+from detector.face_backends import create_face_detector
+from detector.face_search import _tracker_factory, create_face_search, process_frame
+from detector.replay import iter_frames
+
+CLIPS = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "assets", "media", "*.mp4")))
+MAX_MISMATCH = 0.05           # Fraction of frames where track mode may disagree
+
+
+def face_timeline(source, mode, tracker_kind="MOSSE") -> list:
+    detector = create_face_detector("haar", scale_factor=1.1, min_neighbors=6)
+    params = {"tracker_kind": tracker_kind} if mode == "track" else {}
+    face_search = create_face_search(mode, detector, min_size=(100, 100), **params)
+    return [bool(process_frame(frame, face_search)[1]) for _, frame in iter_frames(source)]
+
+
+@pytest.mark.parametrize("tracker_kind", ["MOSSE", "KCF"])
+@pytest.mark.parametrize("clip", CLIPS, ids=os.path.basename)
+def test_track_mode_matches_full_scan(clip, tracker_kind):
+    if _tracker_factory(tracker_kind) is None:
+        pytest.skip(f"OpenCV tracker {tracker_kind} unavailable")
+    full = face_timeline(clip, "full")
+    tracked = face_timeline(clip, "track", tracker_kind)
+
+    assert len(tracked) == len(full)
+    mismatches = sum(a != b for a, b in zip(full, tracked))
+    assert mismatches <= MAX_MISMATCH * len(full), (
+        f"{mismatches}/{len(full)} frames differ: full {sum(full)} hits, track {sum(tracked)}"
+    )
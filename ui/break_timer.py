@@ -4,19 +4,33 @@ to encourage the user to move during their break.
 """
 
 import os
+import time
 
 import cv2
 import tkinter as tk
 from PIL import Image, ImageTk
 
+from detector.face_backends import DEFAULT_BACKEND, create_face_detector
+from detector.camera_service import get_camera_service
+from detector.gif_frames import GifStream
+from detector.motion_energy import MotionEnergy
+from detector.video_stream import VideoDecoder
+from ui.view_state import ViewState
+
 # Project root (two levels up from this file: project/ui/break_timer.py → project/)
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 class BreakApp:
     BREAK_DURATION_SECONDS = 300  # 5 minutes
+    CAMERA_FPS = 15               # Cap on webcam frames processed per second
+    CAMERA_POLL_MS = 30           # How often the Tk side checks for a new camera frame
+    GIF_POLL_MS = 10              # Retry delay while the next GIF frame is still decoding
+    FACE_CHECK_INTERVAL_S = 0.5   # Face detection only checks distance from the screen
+    TOO_CLOSE_WIDTH = 120         # Face box width (px) that counts as too close
 
     def __init__(self, window):
+        self._opened_at = time.perf_counter()
         self.window = window
         self.window.title("Break Time")
         self.window.geometry("1000x550")
@@ -24,14 +38,18 @@ class BreakApp:
 
         self.time_left = self.BREAK_DURATION_SECONDS
         self.is_running = True
+        self.view = ViewState()
 
         self._build_ui()
         self._init_camera()
         self._load_video()
         self._load_gif()
 
+        # Each stream runs on its own clock so a slow source can't starve the others.
         self.update_timer()
-        self.update_media()
+        self.update_camera()
+        self.update_video()
+        self.update_gif()
 
     # ------------------------------------------------------------------
     # UI construction
@@ -56,6 +74,15 @@ class BreakApp:
         )
         self.warning_label.pack(pady=10)
 
+        self.activity_label = tk.Label(
+            self.window,
+            text="ACTIVE 0s",
+            font=("Arial", 14, "bold"),
+            fg="black",
+            bg="#8ACE00",
+        )
+        self.activity_label.pack()
+
         self.media_frame = tk.Frame(self.window, bg="#8ACE00")
         self.media_frame.pack(expand=True, fill="both")
 
@@ -82,35 +109,39 @@ class BreakApp:
     # ------------------------------------------------------------------
 
     def _init_camera(self):
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        self.face_detector = create_face_detector(
+            DEFAULT_BACKEND, scale_factor=1.1, min_neighbors=5
         )
+        self.motion = MotionEnergy()
+        self.faces = []
+        self._last_face_check = 0.0
+        self._last_camera_tick = None
 
-        self.cap = cv2.VideoCapture(1, cv2.CAP_DSHOW)
-        if not self.cap.isOpened():
-            self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+        # Shares the tracker's already-open device when coming from a focus
+        # session; only CAMERA_FPS frames/s are decoded for this screen.
+        self.camera = get_camera_service().acquire(interval=1.0 / self.CAMERA_FPS)
 
     def _load_video(self):
         vid_path = os.path.join(ROOT_DIR, "assets", "videos", "dance_break.mp4")
-        self.has_video = os.path.exists(vid_path)
-        if self.has_video:
-            self.video_cap = cv2.VideoCapture(vid_path)
+        self.video = None
+        if os.path.exists(vid_path):
+            # Decoded off-thread at the file's own fps, skipping frames to catch up.
+            self.video = VideoDecoder(vid_path, size=(300, 250), loop=True)
+            self.video.start()
         else:
             print(f"Warning: Dance-break video not found at {vid_path}")
 
     def _load_gif(self):
-        self.gif_frames = []
+        # Frames are decoded progressively in the background (see
+        # detector/gif_frames.py) so the window never waits for the whole GIF.
+        self.gif_stream = None
+        self._gif_shown = False
         gif_path = os.path.join(ROOT_DIR, "assets", "media", "dancing-cat.gif")
-        try:
-            gif = Image.open(gif_path)
-            for i in range(gif.n_frames):
-                gif.seek(i)
-                frame = gif.copy().convert("RGBA")
-                frame = frame.resize((300, 250), Image.Resampling.LANCZOS)
-                self.gif_frames.append(ImageTk.PhotoImage(frame))
-        except Exception as e:
-            print(f"Failed to load GIF: {e}")
-        self.current_gif_frame = 0
+        if not os.path.exists(gif_path):
+            print(f"Failed to load GIF: {gif_path} not found")
+            return
+        self.gif_stream = GifStream(gif_path, max_size=(300, 250))
+        self.gif_stream.start()
 
     # ------------------------------------------------------------------
     # Update loops
@@ -122,48 +153,74 @@ class BreakApp:
 
         if self.time_left > 0:
             mins, secs = divmod(self.time_left, 60)
-            self.timer_label.config(text=f"{mins:02d}:{secs:02d}")
+            self.view.apply(self.timer_label, text=f"{mins:02d}:{secs:02d}")
             self.time_left -= 1
             self.window.after(1000, self.update_timer)
         else:
-            self.timer_label.config(text="BREAK OVER!", fg="red")
+            self.view.apply(self.timer_label, text="BREAK OVER!", fg="red")
 
-    def update_media(self):
-        if not self.window.winfo_exists() or not self.is_running:
-            return
+    def _media_running(self) -> bool:
+        return self.is_running and self.window.winfo_exists()
 
+    def update_camera(self):
+        if not self._media_running() or self.camera is None:
+            return
         self._update_camera_feed()
+        self.window.after(self.CAMERA_POLL_MS, self.update_camera)
+
+    def update_video(self):
+        if not self._media_running() or self.video is None or self.video.is_done:
+            return
         self._update_video_feed()
-        self._update_gif()
+        self.window.after(max(10, int(self.video.frame_interval * 1000)), self.update_video)
 
-        self.window.after(33, self.update_media)
+    def update_gif(self):
+        if not self._media_running() or self.gif_stream is None:
+            return
+        if self.gif_stream.failed:
+            self.gif_stream = None
+            self.gif_label.imgtk = None
+            self.gif_label.configure(image="", text="GIF MISSING")
+            return
+        duration = self._update_gif()
+        self.window.after(duration or self.GIF_POLL_MS, self.update_gif)
 
     def _update_camera_feed(self):
-        if not (hasattr(self, "cap") and self.cap.isOpened()):
+        frame = self.camera.latest()
+        if frame is None:
             return
 
-        ret, frame = self.cap.read()
-        if not ret:
-            return
+        now = time.monotonic()
+        dt = 0.0 if self._last_camera_tick is None else now - self._last_camera_tick
+        self._last_camera_tick = now
 
         frame = cv2.flip(frame, 1)
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(30, 30))
-
-        warning_text = "NO ONE DETECTED"
-        tk_color = "white"
-
-        for (x, y, w, h) in faces:
-            if w > 120:
-                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 2)
-                warning_text = "STAND UP & STEP BACK!"
-                tk_color = "red"
-            else:
-                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                warning_text = "GOOD JOB! KEEP MOVING"
-                tk_color = "black"
+        self.motion.update(frame, dt)
+
+        # Movement comes from the motion score; the (much slower) face scan
+        # only runs occasionally to check distance from the screen.
+        if now - self._last_face_check >= self.FACE_CHECK_INTERVAL_S:
+            self._last_face_check = now
+            self.faces = self.face_detector.detect(frame, min_size=(30, 30))
+
+        too_close = False
+        for (x, y, w, h) in self.faces:
+            close = w > self.TOO_CLOSE_WIDTH
+            too_close = too_close or close
+            color = (0, 0, 255) if close else (0, 255, 0)
+            cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+
+        if too_close:
+            warning_text, tk_color = "STAND UP & STEP BACK!", "red"
+        elif self.motion.is_active:
+            warning_text, tk_color = "GOOD JOB! KEEP MOVING", "black"
+        elif len(self.faces):
+            warning_text, tk_color = "KEEP MOVING!", "white"
+        else:
+            warning_text, tk_color = "NO ONE DETECTED", "white"
 
-        self.warning_label.config(text=warning_text, fg=tk_color)
+        self.view.apply(self.warning_label, text=warning_text, fg=tk_color)
+        self.view.apply(self.activity_label, text=f"ACTIVE {int(self.motion.active_seconds)}s")
 
         frame = cv2.resize(frame, (300, 250))
         img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
@@ -172,37 +229,44 @@ class BreakApp:
         self.cam_label.configure(image=imgtk)
 
     def _update_video_feed(self):
-        if not (self.has_video and self.video_cap.isOpened()):
+        img = self.video.next_frame()
+        if img is None:
             return
-
-        ret, frame = self.video_cap.read()
-        if not ret:
-            self.video_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, frame = self.video_cap.read()
-
-        if ret:
-            frame = cv2.resize(frame, (300, 250))
-            img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.video_label.imgtk = imgtk
-            self.video_label.configure(image=imgtk)
+        imgtk = ImageTk.PhotoImage(image=img)
+        self.video_label.imgtk = imgtk
+        self.video_label.configure(image=imgtk)
 
     def _update_gif(self):
-        if not self.gif_frames:
-            return
-        self.gif_label.configure(image=self.gif_frames[self.current_gif_frame])
-        self.current_gif_frame = (self.current_gif_frame + 1) % len(self.gif_frames)
+        """Show the next GIF frame; return its duration in ms (``None`` if not decoded yet)."""
+        item = self.gif_stream.next_frame()
+        if item is None:
+            return None
+        frame, duration = item
+        imgtk = ImageTk.PhotoImage(frame)
+        self.gif_label.imgtk = imgtk
+        self.gif_label.configure(image=imgtk)
+
+        if not self._gif_shown:
+            self._gif_shown = True
+            elapsed_ms = (time.perf_counter() - self._opened_at) * 1000
+            print(f"Break screen: first GIF frame shown {elapsed_ms:.0f} ms after opening")
+        return duration
 
     # ------------------------------------------------------------------
     # Cleanup
     # ------------------------------------------------------------------
 
     def cleanup(self):
+        if self.is_running and hasattr(self, "motion"):
+            print(f"Break: {self.motion.active_seconds:.0f}s of active movement")
         self.is_running = False
-        if hasattr(self, "cap") and self.cap and self.cap.isOpened():
-            self.cap.release()
-        if hasattr(self, "video_cap") and self.has_video and self.video_cap.isOpened():
-            self.video_cap.release()
+        if getattr(self, "gif_stream", None):
+            self.gif_stream.stop()
+        if getattr(self, "video", None):
+            self.video.stop()
+        if getattr(self, "camera", None):
+            self.camera.release()
+            self.camera = None
 
     def __del__(self):
         self.cleanup()
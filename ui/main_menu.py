@@ -92,9 +92,7 @@ class MainMenu:
 
     def on_close_tracker(self):
         if hasattr(self, "app"):
-            self.app.is_running = False
-            if hasattr(self.app, "cap") and self.app.cap and self.app.cap.isOpened():
-                self.app.cap.release()
+            self.app.cleanup()
         if hasattr(self, "tracker_window") and self.tracker_window.winfo_exists():
             self.tracker_window.destroy()
         self.root.deiconify()
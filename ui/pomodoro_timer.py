@@ -7,6 +7,8 @@ import os
 import tkinter as tk
 from PIL import Image, ImageTk
 
+from ui.view_state import ViewState
+
 # Project root (two levels up: project/ui/pomodoro_timer.py → project/)
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -37,13 +39,15 @@ class RizeGlowBar:
         self.seconds_left = 25 * 60
         self.distractions = 0
         self.focus_state = "focused"
+        self.view = ViewState()
 
         self._configure_root()
         self._load_companion_images()
         self._build_main_bar()
         self._bind_drag_events()
 
-        self.update_sync()
+        self._companion_state = None  # (visible, bar_y) last applied to the companions
+        self.update_sync(self.y_limit)
         self.update_timer()
 
     # ------------------------------------------------------------------
@@ -151,6 +155,7 @@ class RizeGlowBar:
             widget.bind("<ButtonRelease-1>", self._snap_to_position)
 
         self.root.bind("<Button-3>", lambda e: self.root.destroy())
+        self.root.bind("<Configure>", self._on_configure)
 
     # ------------------------------------------------------------------
     # Drag behaviour
@@ -164,44 +169,59 @@ class RizeGlowBar:
         if new_y < self.y_limit:
             new_y = self.y_limit
         self.root.geometry(f"+0+{int(new_y)}")
+        self.update_sync(new_y)
 
     def _snap_to_position(self, event):
         current_y = self.root.winfo_y()
         if current_y > self.y_limit + 25:
             self.root.geometry(f"+0+{self.y_hidden}")
-            self.root.config(bg=self.BRAT_GREEN)
+            self.view.apply(self.root, bg=self.BRAT_GREEN)
             self.main_frame.pack_forget()
+            self.update_sync(self.y_hidden)
         else:
             self.root.geometry(f"+0+{self.y_limit}")
-            self.root.config(bg=self.BG_BLACK)
+            self.view.apply(self.root, bg=self.BG_BLACK)
             self.main_frame.pack(expand=True, fill="both", padx=20)
+            self.update_sync(self.y_limit)
+
+    def _on_configure(self, event):
+        # <Configure> also fires for every child widget via the toplevel bindtag.
+        if event.widget is self.root:
+            self.update_sync(event.y)
 
     # ------------------------------------------------------------------
-    # Update loops
+    # Companion placement & update loop
     # ------------------------------------------------------------------
 
-    def update_sync(self):
-        bar_y = self.root.winfo_y()
+    def update_sync(self, bar_y):
+        """Move the companions to follow a bar at ``bar_y``; no-op if unchanged."""
+        bar_y = int(bar_y)
+        visible = bar_y < self.y_hidden
+        state = (visible, bar_y if visible else None)
+        if state == self._companion_state:
+            return
+        was_visible = self._companion_state is not None and self._companion_state[0]
+        self._companion_state = state
+
+        if not visible:
+            self.cat_root.withdraw()
+            self.gauge_root.withdraw()
+            return
+
         right_x = self.screen_width - self.comp_w
         left_x = 20
-
         cat_y = bar_y - self.comp_h + 5
         gauge_y = bar_y - self.comp_h - 5
 
-        if bar_y >= self.y_hidden:
-            self.cat_root.withdraw()
-            self.gauge_root.withdraw()
-        else:
+        if not was_visible:
             self.cat_root.deiconify()
             self.gauge_root.deiconify()
-            self.cat_root.geometry(
-                f"{self.comp_w}x{self.comp_h}+{int(right_x)}+{int(cat_y)}"
-            )
-            self.gauge_root.geometry(
-                f"{self.comp_w}x{self.comp_h}+{int(left_x)}+{int(gauge_y)}"
-            )
-
-        self.root.after(10, self.update_sync)
+        self.cat_root.geometry(
+            f"{self.comp_w}x{self.comp_h}+{int(right_x)}+{int(cat_y)}"
+        )
+        self.gauge_root.geometry(
+            f"{self.comp_w}x{self.comp_h}+{int(left_x)}+{int(gauge_y)}"
+        )
 
     def update_timer(self):
         if self.focus_state != "distracted" and self.seconds_left > 0:
@@ -213,38 +233,44 @@ class RizeGlowBar:
         if self.focus_state == "distracted":
             if self.root.winfo_y() > self.y_limit + 10:
                 self._snap_to_position(None)
-            self.cat_display.config(image=self.img_cat_open)
-            self.gauge_display.config(image=self.img_high_cort)
-            self.timer_label.config(text="TOUCH GRASS!!", fg=self.ALERT_RED)
-            self.status_label.config(
+            self.view.apply(self.cat_display, image=self.img_cat_open)
+            self.view.apply(self.gauge_display, image=self.img_high_cort)
+            self.view.apply(self.timer_label, text="TOUCH GRASS!!", fg=self.ALERT_RED)
+            self.view.apply(
+                self.status_label,
                 text="DOOMSCROLLING!!", fg=self.ALERT_RED,
                 font=("Arial", 18, "bold italic"),
             )
-            self.distract_label.config(
+            self.view.apply(
+                self.distract_label,
                 text=f"DISTRACTIONS: {self.distractions}", fg=self.ALERT_RED
             )
 
         elif self.focus_state == "looking_away":
-            self.cat_display.config(image=self.img_cat_open)
-            self.gauge_display.config(image=self.img_low_cort)
-            self.timer_label.config(text=time_string, fg=self.WARN_ORANGE)
-            self.status_label.config(
+            self.view.apply(self.cat_display, image=self.img_cat_open)
+            self.view.apply(self.gauge_display, image=self.img_low_cort)
+            self.view.apply(self.timer_label, text=time_string, fg=self.WARN_ORANGE)
+            self.view.apply(
+                self.status_label,
                 text="LOOKING AWAY...", fg=self.WARN_ORANGE,
                 font=("Arial", 18, "bold"),
             )
-            self.distract_label.config(
+            self.view.apply(
+                self.distract_label,
                 text=f"DISTRACTIONS: {self.distractions}", fg=self.WARN_ORANGE
             )
 
         else:  # focused
-            self.cat_display.config(image=self.img_cat_closed)
-            self.gauge_display.config(image=self.img_low_cort)
-            self.timer_label.config(text=time_string, fg=self.BRAT_GREEN)
-            self.status_label.config(
+            self.view.apply(self.cat_display, image=self.img_cat_closed)
+            self.view.apply(self.gauge_display, image=self.img_low_cort)
+            self.view.apply(self.timer_label, text=time_string, fg=self.BRAT_GREEN)
+            self.view.apply(
+                self.status_label,
                 text="STAY FOCUSED", fg=self.BRAT_GREEN,
                 font=("Arial", 18, "bold"),
             )
-            self.distract_label.config(
+            self.view.apply(
+                self.distract_label,
                 text=f"DISTRACTIONS: {self.distractions}", fg=self.BRAT_GREEN
             )
 
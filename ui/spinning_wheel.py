@@ -6,19 +6,20 @@ the CLIP zero-shot image-classification model.
 
 import math
 import random
-import threading
 import tkinter as tk
 
 import cv2
 from PIL import Image, ImageTk
-from transformers import pipeline
 
+from detector.camera_service import get_camera_service
+from detector.grass_service import get_grass_service
 from ui.telegram_app import TypeWriterApp
 
 
 class ChallengeWheel:
     CHALLENGES = ["touch grass", "shower", "exercise"]
     SLICE_COLORS = ["#ffffff", "#000000"]
+    GRASS_POLL_MS = 50            # How often the UI checks for the classifier's answer
 
     def __init__(self, root):
         self.root = root
@@ -29,9 +30,10 @@ class ChallengeWheel:
 
         self._center_window(500, 700)
 
-        # Load AI model in background to keep UI responsive
-        self.classifier = None
-        threading.Thread(target=self._load_model, daemon=True).start()
+        # The classifier lives in a session-wide service: already warm if the
+        # tracker pre-loaded it, otherwise loading starts now in the background.
+        self.grass = get_grass_service()
+        self.grass.start()
 
         self.root.bind("<Escape>", lambda e: self.close_app())
 
@@ -77,11 +79,6 @@ class ChallengeWheel:
         y = (sh // 2) - (height // 2)
         self.root.geometry(f"{width}x{height}+{x}+{y}")
 
-    def _load_model(self):
-        self.classifier = pipeline(
-            "zero-shot-image-classification", model="openai/clip-vit-base-patch32"
-        )
-
     # ------------------------------------------------------------------
     # Wheel drawing & spinning
     # ------------------------------------------------------------------
@@ -192,7 +189,7 @@ class ChallengeWheel:
         )
         self.status_label.pack(pady=10)
 
-        self.cap = cv2.VideoCapture(1, cv2.CAP_DSHOW)
+        self.camera = get_camera_service().acquire()
         self.camera_running = True
         self.current_img = None
         self._update_camera_frame()
@@ -203,8 +200,8 @@ class ChallengeWheel:
     def _update_camera_frame(self):
         if not self.camera_running:
             return
-        success, frame = self.cap.read()
-        if success:
+        frame = self.camera.latest()
+        if frame is not None:
             frame = cv2.flip(frame, 1)
             frame = cv2.resize(frame, (400, 280))
             self.current_img = Image.fromarray(
@@ -234,18 +231,23 @@ class ChallengeWheel:
         self.root.after(100, self._analyze_image)
 
     def _analyze_image(self):
-        if self.classifier is None:
-            self.status_label.config(text="LOADING AI MODEL... PLEASE WAIT", fg="orange")
-            self.root.after(1000, self._analyze_image)
+        self.grass_request = self.grass.classify(self.current_img)
+        self._await_grass_result()
+
+    def _await_grass_result(self):
+        if not self.grass_request.done():
+            if not self.grass.ready.is_set():
+                self.status_label.config(text="LOADING AI MODEL... PLEASE WAIT", fg="orange")
+            self.root.after(self.GRASS_POLL_MS, self._await_grass_result)
             return
 
-        results = self.classifier(
-            self.current_img, candidate_labels=["grass", "not grass"]
-        )
-        grass_score = next(
-            (item["score"] for item in results if item["label"] == "grass"), 0
-        )
-        accuracy = grass_score * 100
+        try:
+            accuracy = self.grass_request.result() * 100
+        except Exception as e:
+            print(f"Error analyzing image: {e}")
+            self.status_label.config(text="AI MODEL UNAVAILABLE", fg="red")
+            self.root.after(2000, self._trigger_sike)
+            return
 
         if accuracy > 50:
             self.status_label.config(text=f"GRASS DETECTED: {accuracy:.2f}%", fg="green")
@@ -286,8 +288,9 @@ class ChallengeWheel:
 
     def _release_camera(self):
         self.camera_running = False
-        if hasattr(self, "cap") and self.cap.isOpened():
-            self.cap.release()
+        if getattr(self, "camera", None):
+            self.camera.release()
+            self.camera = None
 
     def close_app(self):
         self._release_camera()
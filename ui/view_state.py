@@ -0,0 +1,41 @@
+"""
+View state — a small retained-mode layer over Tk widgets. It remembers the
+options (text, colours, images, fonts, …) last applied to each widget and
+only pushes the ones that changed, so per-tick UI code can describe what a
+widget *should* look like without paying for redundant reconfigures and
+relayouts.
+"""
+
+
+class ViewState:
+    def __init__(self):
+        self._applied: dict = {}   # Widget path → {option: last applied value}
+        self.pushes = 0            # config() calls actually sent to Tk
+        self.skips = 0             # apply() calls that changed nothing
+
+    def apply(self, widget, **options) -> bool:
+        """Configure ``widget`` with only the options that differ; return whether any did."""
+        applied = self._applied.setdefault(str(widget), {})
+        changes = {
+            name: value for name, value in options.items()
+            if name not in applied or not _same(applied[name], value)
+        }
+        if not changes:
+            self.skips += 1
+            return False
+        widget.config(**changes)
+        applied.update(changes)
+        self.pushes += 1
+        return True
+
+    def forget(self, widget=None):
+        """Drop cached state for ``widget`` (or every widget) after external changes."""
+        if widget is None:
+            self._applied.clear()
+        else:
+            self._applied.pop(str(widget), None)
+
+
+def _same(old, new) -> bool:
+    # PhotoImages compare by identity; everything else (str, tuples) by value.
+    return old is new or (type(old) is type(new) and old == new)